@@ -18,6 +18,8 @@ from routes.recipe_routes import router as recipe_router
 from routes.grocery_routes import router as grocery_router
 from routes.import_job_routes import router as import_job_router
 from config import UPLOAD_DIR
+from services.media_storage_service import close_http_client
+from services.recipe_extraction_service import close_web_client
 from utils.helpers import setup_logger
 
 # Setup logging
@@ -32,6 +34,8 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     logger.info("Shutting down souschef API")
+    await close_http_client()
+    await close_web_client()
 
 # FastAPI app with enhanced metadata and modern lifespan events
 app = FastAPI(
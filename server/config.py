@@ -6,6 +6,7 @@ Provides configuration validation and initialization.
 """
 
 import os
+import tempfile
 from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
@@ -43,8 +44,12 @@ class Config:
     
     # Application Settings
     UPLOAD_DIR: str = "uploads"
+    # Persistent OCR text cache; must stay outside UPLOAD_DIR, which is served publicly
+    OCR_CACHE_DIR: str = os.getenv('OCR_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'souschef-ocr-cache'))
     DEBUG: bool = os.getenv('DEBUG', 'False').lower() == 'true'
     ENVIRONMENT: str = os.getenv('ENVIRONMENT', 'development')
+    # Worker processes in the shared OCR pool (image and PDF OCR)
+    OCR_WORKERS: int = int(os.getenv('OCR_WORKERS', os.cpu_count() or 1))
     
     # Server Configuration
     HOST: str = os.getenv('HOST', '0.0.0.0')
@@ -96,6 +101,8 @@ SUPABASE_URL = config.SUPABASE_URL
 SUPABASE_KEY = config.SUPABASE_KEY
 SUPABASE_JWT_SECRET = config.SUPABASE_JWT_SECRET
 UPLOAD_DIR = config.UPLOAD_DIR
+OCR_CACHE_DIR = config.OCR_CACHE_DIR
+OCR_WORKERS = config.OCR_WORKERS
 
 # Messaging configuration (for grocery routes)
 senderEmail = config.SENDER_EMAIL
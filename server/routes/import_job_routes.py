@@ -7,10 +7,11 @@ return 202 + job_id immediately, and run extraction in a background task.
 
 from __future__ import annotations
 
+import os
 from io import BytesIO
 from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, BackgroundTasks, File, Header, HTTPException, UploadFile
+from fastapi import APIRouter, BackgroundTasks, File, Header, HTTPException, Response, UploadFile
 from pydantic import BaseModel
 from starlette.datastructures import UploadFile as StarletteUploadFile
 
@@ -18,10 +19,10 @@ from models.schemas import InstagramURL
 from services.auth_service import get_current_user
 from services.image_service import process_multiple_recipe_images
 from services.import_job_service import import_job_service
-from services.pdf_service import process_recipe_pdf
+from services.pdf_service import process_recipe_pdf_file, save_pdf_upload
 from services.recipe_extraction_service import recipe_extraction_service
 from utils.constants import StatusCodes
-from utils.helpers import format_success_response, setup_logger
+from utils.helpers import format_success_response, format_success_response_bytes, setup_logger
 
 logger = setup_logger(__name__)
 
@@ -133,23 +134,18 @@ async def _run_images_job(
 
 async def _run_pdf_job(
     job_id: str,
-    content: bytes,
+    pdf_path: str,
     filename: str,
     user_id: Optional[str],
 ) -> None:
     await import_job_service.mark_running(job_id)
-    uf = StarletteUploadFile(
-        BytesIO(content),
-        filename=filename or "recipe.pdf",
-        headers={"content-type": "application/pdf"},
-    )
 
     async def on_progress(stage: str, label: str, pct: int) -> None:
         await import_job_service.update_progress(job_id, stage=stage, stage_label=label, percent=pct)
 
     try:
-        result = await process_recipe_pdf(
-            uf, background_tasks=None, user_id=user_id, on_progress=on_progress
+        result = await process_recipe_pdf_file(
+            pdf_path, filename, user_id=user_id, on_progress=on_progress
         )
         err = _extraction_error_message(result)
         if err:
@@ -222,9 +218,15 @@ async def start_pdf_import(
     if not pdf.content_type or not pdf.content_type.startswith("application/pdf"):
         raise HTTPException(status_code=StatusCodes.BAD_REQUEST, detail="File must be a PDF")
     user_id = await get_current_user(authorization)
-    content = await pdf.read()
-    job_id = await import_job_service.create_job()
-    background_tasks.add_task(_run_pdf_job, job_id, content, pdf.filename or "recipe.pdf", user_id)
+    # Spool to disk now (the upload is closed once the response is sent); the job
+    # deletes the file when it finishes
+    pdf_path = await save_pdf_upload(pdf)
+    try:
+        job_id = await import_job_service.create_job()
+    except BaseException:
+        os.unlink(pdf_path)
+        raise
+    background_tasks.add_task(_run_pdf_job, job_id, pdf_path, pdf.filename or "recipe.pdf", user_id)
     return format_success_response({"job_id": job_id}, "Import job started")
 
 
@@ -233,4 +235,6 @@ async def get_import_job(job_id: str):
     row = import_job_service.get_job(job_id)
     if not row:
         raise HTTPException(status_code=404, detail="Job not found or expired")
-    return format_success_response(row, "OK")
+    # Polled every second or so per import; serialize once with orjson instead of
+    # FastAPI's jsonable_encoder + json.dumps over the whole result payload
+    return Response(content=format_success_response_bytes(row, "OK"), media_type="application/json")
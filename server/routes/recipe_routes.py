@@ -16,6 +16,7 @@ from pydantic import BaseModel
 from models.schemas import InstagramURL
 from services.recipe_extraction_service import recipe_extraction_service
 from services.image_service import process_multiple_recipe_images
+from services.pdf_service import process_recipe_pdf
 from services.auth_service import get_current_user
 from services.db_service import get_user_recipes, get_user_recipe_by_id
 from services.media_storage_service import (
@@ -117,7 +118,7 @@ async def extract_recipe_from_pdf(
     Extract recipe from uploaded PDF file
     
     Supports PDF text extraction and OCR for scanned PDFs.
-    Uses PyPDF2 for text-based PDFs and falls back to OCR for image-based PDFs.
+    Uses PyPDF2 (or PyMuPDF, if installed) for text-based PDFs and falls back to OCR for image-based PDFs.
     """
     if not pdf:
         raise HTTPException(
@@ -137,8 +138,6 @@ async def extract_recipe_from_pdf(
         user_id = await get_current_user(authorization)
         logger.info(f"Processing PDF file '{pdf.filename}' for user: {user_id}")
         
-        # Import the PDF processing service
-        from services.pdf_service import process_recipe_pdf
         result = await process_recipe_pdf(pdf, background_tasks, user_id)
         
         logger.info(f"Successfully processed PDF file: {pdf.filename}")
@@ -1,6 +1,6 @@
 import httpx
 import re
-import json
+import orjson
 from typing import Optional, Dict, Any
 from config import OPENROUTER_API_KEY, OPENROUTER_MAX_TOKENS
 from utils.helpers import setup_logger
@@ -8,6 +8,9 @@ from utils.helpers import setup_logger
 # Setup logging
 logger = setup_logger(__name__)
 
+# Outermost {...} block in the model reply
+_JSON_OBJECT_RE = re.compile(r'({[\s\S]*})')
+
 async def process_with_ai(content: str) -> Optional[Dict[str, Any]]:
     """Process recipe content with OpenRouter AI to extract structured recipe data.
 
@@ -114,14 +117,14 @@ Return ONLY the JSON object with no additional text, explanations, or formatting
                 logger.error(f"API Error: {response.status_code} - {response.text}")
                 return None
                 
-            result = response.json()
+            result = orjson.loads(response.content)
             ai_response = result["choices"][0]["message"]["content"]
             
             # Extract JSON from response with better error handling
-            json_match = re.search(r'({[\s\S]*})', ai_response.strip())
+            json_match = _JSON_OBJECT_RE.search(ai_response.strip())
             if json_match:
                 try:
-                    parsed_data = json.loads(json_match.group(1))
+                    parsed_data = orjson.loads(json_match.group(1))
                     
                     # Safety check: Ensure servings defaults to 2 if not reasonable
                     if 'servings' not in parsed_data or not isinstance(parsed_data['servings'], int) or parsed_data['servings'] <= 0:
@@ -130,7 +133,7 @@ Return ONLY the JSON object with no additional text, explanations, or formatting
                     
                     return parsed_data
                     
-                except json.JSONDecodeError as e:
+                except orjson.JSONDecodeError as e:
                     logger.error(f"JSON parsing error: {e}")
                     logger.debug(f"Raw response: {ai_response}")
                     return None
@@ -1,8 +1,15 @@
+import os
 from fastapi import HTTPException, Header
 from typing import Optional
 from config import supabase
 from utils.helpers import setup_logger
 
+try:
+    import jwt
+    from jwt import PyJWTError
+except ImportError:
+    jwt = None
+
 # Setup logging
 logger = setup_logger(__name__)
 
@@ -27,18 +34,15 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> Optio
         except Exception as e:
             logger.warn(f"Token verification failed: {e}")
             # Alternative method - try to verify the token manually
-            try:
-                import jwt
-                import os
-                from jwt import PyJWTError
-                
-                # Get JWT secret from Supabase (this would be your JWT secret)
-                jwt_secret = os.getenv('SUPABASE_JWT_SECRET')
-                if jwt_secret:
-                    decoded = jwt.decode(token, jwt_secret, algorithms=['HS256'])
-                    return decoded.get('sub')  # 'sub' contains the user ID
-            except (PyJWTError, ImportError):
-                pass
+            if jwt is not None:
+                try:
+                    # Get JWT secret from Supabase (this would be your JWT secret)
+                    jwt_secret = os.getenv('SUPABASE_JWT_SECRET')
+                    if jwt_secret:
+                        decoded = jwt.decode(token, jwt_secret, algorithms=['HS256'])
+                        return decoded.get('sub')  # 'sub' contains the user ID
+                except PyJWTError:
+                    pass
             
             return None
         
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from typing import Dict, Any, Optional, List
 from config import supabase
@@ -141,8 +142,8 @@ async def save_recipe_to_db(recipe_data: Dict[str, Any], source_url: str, image_
         # Remove None values to avoid database issues
         recipe_insert = {k: v for k, v in recipe_insert.items() if v is not None}
         
-        # Insert recipe
-        recipe_result = supabase.table("recipes").insert(recipe_insert).execute()
+        # Insert recipe (the Supabase client is synchronous, so run its HTTP calls off the event loop)
+        recipe_result = await asyncio.to_thread(supabase.table("recipes").insert(recipe_insert).execute)
         if not recipe_result.data:
             logger.error("Failed to insert recipe")
             return None
@@ -174,7 +175,7 @@ async def save_recipe_to_db(recipe_data: Dict[str, Any], source_url: str, image_
             
             if ingredient_inserts:
                 try:
-                    ingredient_result = supabase.table("ingredients").insert(ingredient_inserts).execute()
+                    ingredient_result = await asyncio.to_thread(supabase.table("ingredients").insert(ingredient_inserts).execute)
                     if not ingredient_result.data:
                         logger.warn("Failed to insert some ingredients")
                 except Exception as e:
@@ -206,7 +207,7 @@ async def save_recipe_to_db(recipe_data: Dict[str, Any], source_url: str, image_
             
             if instruction_inserts:
                 try:
-                    instruction_result = supabase.table("instructions").insert(instruction_inserts).execute()
+                    instruction_result = await asyncio.to_thread(supabase.table("instructions").insert(instruction_inserts).execute)
                     if not instruction_result.data:
                         logger.warn("Failed to insert some instructions")
                 except Exception as e:
@@ -5,32 +5,76 @@ This service handles image upload, validation, OCR processing, and
 AI-powered recipe extraction from image content.
 """
 
+import io
 import uuid
 import shutil
-import sys
 import os
 import subprocess
 import asyncio
+import hashlib
+import importlib.util
+import mmap
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Awaitable, BinaryIO, Callable, Dict, List, Optional, Tuple
 
 ProgressCb = Optional[Callable[[str, str, int], Awaitable[None]]]
-from PIL import Image
-import pytesseract
 from fastapi import UploadFile, HTTPException, BackgroundTasks
 
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# PIL, pytesseract and tesserocr are only imported where OCR actually runs (the OCR
+# pool workers), so importing this module from the routes doesn't load the OCR stack
+if TYPE_CHECKING:
+    import tesserocr
+    from PIL import Image
+
+TESSEROCR_AVAILABLE = importlib.util.find_spec("tesserocr") is not None
+
 # Local imports
 from services.ai_service import process_with_ai
 from services.db_service import save_recipe_to_db
-from config import UPLOAD_DIR
+from config import OCR_CACHE_DIR, OCR_WORKERS, UPLOAD_DIR
 from utils.constants import FileConfig, OCRConfig, Messages, StatusCodes
 from utils.helpers import setup_logger
 
 # Setup logging
 logger = setup_logger(__name__)
 
+# Tesseract's OpenMP threading scales poorly; one single-threaded engine per core is faster
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+# Process pool for OCR work, created on first use
+_ocr_pool: Optional[ProcessPoolExecutor] = None
+
+def _ocr_worker_count() -> int:
+    return max(1, OCR_WORKERS)
+
+def get_ocr_pool() -> ProcessPoolExecutor:
+    """Get or create the shared OCR process pool"""
+    global _ocr_pool
+
+    if _ocr_pool is None:
+        _ocr_pool = ProcessPoolExecutor(max_workers=_ocr_worker_count())
+        logger.info(f"Created OCR process pool with {_ocr_worker_count()} workers")
+
+    return _ocr_pool
+
+@lru_cache(maxsize=1)
 def check_tesseract_installed() -> bool:
-    """Check if Tesseract is installed and accessible"""
+    """Check if Tesseract is installed and accessible (checked once per process)"""
     try:
         # Try to run tesseract version command
         result = subprocess.run(['tesseract', '--version'], 
@@ -58,19 +102,21 @@ def validate_image_file(image: UploadFile) -> bool:
     """Validate uploaded image file against size and format constraints"""
     # Check file extension
     if not image.filename:
-        logger.warning("Image file has no filename")
         logger.warning("Image file has no filename")
         return False
         
-    file_ext = Path(image.filename).suffix.lower()
+    file_ext = os.path.splitext(image.filename)[1].lower()
     if file_ext not in FileConfig.ALLOWED_IMAGE_EXTENSIONS:
         logger.warning(f"Unsupported file extension: {file_ext}")
         return False
     
-    # Check file size (reset position after checking)
-    image.file.seek(0, 2)  # Seek to end
-    file_size = image.file.tell()
-    image.file.seek(0)  # Reset to beginning
+    # Check file size, preferring the byte count Starlette recorded while spooling the upload
+    file_size = getattr(image, "size", None)
+    if file_size is None:
+        # Fall back to measuring the buffered file (reset position after checking)
+        image.file.seek(0, 2)  # Seek to end
+        file_size = image.file.tell()
+        image.file.seek(0)  # Reset to beginning
     
     if file_size > FileConfig.MAX_IMAGE_SIZE:
         logger.warning(f"File too large: {file_size} bytes (max: {FileConfig.MAX_IMAGE_SIZE})")
@@ -78,6 +124,214 @@ def validate_image_file(image: UploadFile) -> bool:
     
     return True
 
+# OCR results keyed by image content (re-uploads and duplicate shots are common).
+# The in-memory LRU uses fast xxh3 digests; the persistent disk cache keys on SHA-256,
+# where collision safety across runs matters more than hashing speed.
+_OCR_CACHE_MAX_ENTRIES = 256
+_ocr_cache: "OrderedDict[str, str]" = OrderedDict()
+_ocr_disk_cache = diskcache.Cache(OCR_CACHE_DIR) if diskcache else None
+
+def _hash_image_file(image_path: Path, secure: bool = False) -> str:
+    """Hash an image file through mmap, without copying it into a Python bytes object"""
+    with image_path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            data = b""
+        else:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if secure or xxhash is None:
+                return hashlib.sha256(data).hexdigest()
+            return xxhash.xxh3_64_hexdigest(data)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+async def _get_cached_ocr_text(image_path: Path) -> Tuple[Optional[str], str, Optional[str]]:
+    """
+    Look up OCR text for an image in memory, then on disk
+
+    Returns:
+        Tuple of (cached text or None, memory cache key, disk cache key or None)
+    """
+    memory_key = await asyncio.to_thread(_hash_image_file, image_path)
+    text = _ocr_cache.get(memory_key)
+    if text is not None:
+        _ocr_cache.move_to_end(memory_key)
+        return text, memory_key, None
+
+    disk_key = None
+    if _ocr_disk_cache is not None:
+        # Without xxhash the memory key already is the SHA-256 digest
+        disk_key = memory_key if xxhash is None else await asyncio.to_thread(_hash_image_file, image_path, True)
+        text = await asyncio.to_thread(_ocr_disk_cache.get, disk_key)
+        if text is not None:
+            _remember_ocr_text_in_memory(memory_key, text)
+    return text, memory_key, disk_key
+
+def _remember_ocr_text_in_memory(memory_key: str, text: str) -> None:
+    _ocr_cache[memory_key] = text
+    _ocr_cache.move_to_end(memory_key)
+    while len(_ocr_cache) > _OCR_CACHE_MAX_ENTRIES:
+        _ocr_cache.popitem(last=False)
+
+async def _remember_ocr_text(text: str, memory_key: str, disk_key: Optional[str]) -> None:
+    _remember_ocr_text_in_memory(memory_key, text)
+    if _ocr_disk_cache is not None and disk_key is not None:
+        await asyncio.to_thread(_ocr_disk_cache.set, disk_key, text)
+
+# One loaded Tesseract engine per thread (i.e. per OCR pool worker process) and engine mode
+_tess_local = threading.local()
+
+def get_tess_api(lstm_only: bool = False) -> "tesserocr.PyTessBaseAPI":
+    """Loaded tesserocr engine for single-block OCR, reused across calls in this worker"""
+    apis = getattr(_tess_local, "apis", None)
+    if apis is None:
+        apis = _tess_local.apis = {}
+    api = apis.get(lstm_only)
+    if api is None:
+        import tesserocr
+
+        # Same settings as OCRConfig.CONFIG (--oem 3 --psm 6), or OCRConfig.PDF_CONFIG
+        # (--oem 1 --psm 6) for LSTM only
+        oem = tesserocr.OEM.LSTM_ONLY if lstm_only else tesserocr.OEM.DEFAULT
+        api = tesserocr.PyTessBaseAPI(lang="eng", psm=tesserocr.PSM.SINGLE_BLOCK, oem=oem)
+        apis[lstm_only] = api
+    return api
+
+def _ocr_pil_image(img: "Image.Image") -> str:
+    """OCR a PIL image, reusing an already loaded engine when tesserocr is installed"""
+    if TESSEROCR_AVAILABLE:
+        api = get_tess_api()
+        api.SetImage(img)
+        return api.GetUTF8Text()
+    
+    import pytesseract
+    return pytesseract.image_to_string(img, config=OCRConfig.CONFIG)
+
+# Tall screenshots (long scrolling captures, not ordinary portrait photos) are split into
+# overlapping horizontal strips OCR'd in parallel
+_TILE_MIN_HEIGHT = 2000
+_TILE_MIN_ASPECT = 3.0
+_TILE_ROWS = 3
+_TILE_OVERLAP = 0.05
+# Each strip extends at least this far past its boundary, so a line of text always fits
+# whole inside the overlap between neighbouring strips
+_TILE_MIN_MARGIN = 64
+
+# An OCR'd text line: (top, bottom, text), with y in full-image pixels
+_TileLine = Tuple[int, int, str]
+
+def _image_size(image_path: Path) -> Tuple[int, int]:
+    from PIL import Image
+
+    # Image.open only reads the header here, not the pixel data
+    with Image.open(image_path) as img:
+        return img.size
+
+def _tile_boxes(width: int, height: int, rows: int = _TILE_ROWS, overlap: float = _TILE_OVERLAP) -> List[Tuple[int, int, int, int]]:
+    """Crop boxes for horizontal strips, each extended by `overlap` of the height so words aren't cut"""
+    strip_height = -(-height // rows)
+    margin = max(int(height * overlap), _TILE_MIN_MARGIN)
+    return [
+        (0, max(0, i * strip_height - margin), width, min(height, (i + 1) * strip_height + margin))
+        for i in range(rows)
+    ]
+
+def _should_tile(width: int, height: int) -> bool:
+    return height > _TILE_MIN_HEIGHT and height >= width * _TILE_MIN_ASPECT
+
+def _line_center(line: _TileLine) -> float:
+    return (line[0] + line[1]) / 2
+
+def _same_row(a: _TileLine, b: _TileLine) -> bool:
+    """Whether two line boxes cover mostly the same pixel rows"""
+    shared = min(a[1], b[1]) - max(a[0], b[0])
+    return shared > 0 and shared * 2 >= min(a[1] - a[0], b[1] - b[0])
+
+def _merge_tile_lines(tiles: List[Tuple[Tuple[int, int, int, int], List[_TileLine]]]) -> str:
+    """Join strip OCR lines top to bottom, keeping one reading of the rows two strips share.
+
+    Only the known pixel overlap between neighbouring strips is deduplicated; the text
+    itself is never compared, so repeated or near-identical lines elsewhere all survive.
+    Each strip owns the lines centred on its side of the overlap's midline, where the
+    neighbouring strip may have cut them. A line the lower strip centres above the
+    midline is kept too unless the upper strip already kept a line on the same rows, so
+    a line straddling the midline is never lost.
+    """
+    merged: List[_TileLine] = []
+    prev_box: Optional[Tuple[int, int, int, int]] = None
+    for box, lines in tiles:
+        if prev_box is None:
+            merged.extend(lines)
+        else:
+            overlap_top = box[1]
+            midline = (overlap_top + prev_box[3]) / 2
+            merged = [line for line in merged if _line_center(line) < midline]
+            upper = [line for line in merged if line[1] > overlap_top]
+            merged.extend(
+                line for line in lines
+                if _line_center(line) >= midline or not any(_same_row(line, kept) for kept in upper)
+            )
+        prev_box = box
+    return "\n".join(text for _, _, text in merged)
+
+def _prepare_image(img: "Image.Image") -> "Image.Image":
+    """Flatten transparent images onto white, which Tesseract reads far better than black"""
+    from PIL import Image
+
+    if img.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
+        img = background
+    return img
+
+def _ocr_image_file(image_path: str) -> str:
+    """OCR a single image file (runs inside an OCR pool worker process)"""
+    from PIL import Image
+
+    with Image.open(image_path) as img:
+        # Extract text with optimized configuration
+        return _ocr_pil_image(_prepare_image(img))
+
+def _ocr_tile_lines(image_path: str, box: Tuple[int, int, int, int]) -> List[_TileLine]:
+    """OCR one strip of an image into positioned text lines (runs inside an OCR pool worker process)"""
+    from PIL import Image
+
+    with Image.open(image_path) as img:
+        img = _prepare_image(img.crop(box))
+
+    offset = box[1]
+    lines: List[_TileLine] = []
+    if TESSEROCR_AVAILABLE:
+        import tesserocr
+
+        api = get_tess_api()
+        api.SetImage(img)
+        api.Recognize()
+        level = tesserocr.RIL.TEXTLINE
+        for item in tesserocr.iterate_level(api.GetIterator(), level):
+            text = (item.GetUTF8Text(level) or "").strip()
+            bounds = item.BoundingBox(level)
+            if text and bounds:
+                lines.append((offset + bounds[1], offset + bounds[3], text))
+        return lines
+
+    import pytesseract
+
+    data = pytesseract.image_to_data(img, config=OCRConfig.CONFIG, output_type=pytesseract.Output.DICT)
+    words: Dict[Tuple[int, int, int], List[int]] = {}
+    for k, word in enumerate(data["text"]):
+        if word and word.strip():
+            words.setdefault((data["block_num"][k], data["par_num"][k], data["line_num"][k]), []).append(k)
+    for indices in words.values():
+        top = min(data["top"][k] for k in indices)
+        bottom = max(data["top"][k] + data["height"][k] for k in indices)
+        text = " ".join(data["text"][k].strip() for k in indices)
+        lines.append((offset + top, offset + bottom, text))
+    return lines
+
 async def extract_text_from_image(image_path: Path) -> str:
     """Extract text from an image using OCR with comprehensive error handling"""
     try:
@@ -86,40 +340,167 @@ async def extract_text_from_image(image_path: Path) -> str:
             logger.error(f"Image file not found: {image_path}")
             return ""
         
-        # Open and process image
-        with Image.open(image_path) as img:
-            # Convert to RGB if necessary (for PNG with transparency, etc.)
-            # Convert to RGB if necessary for better OCR results
-            if img.mode in ('RGBA', 'LA', 'P'):
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'P':
-                    img = img.convert('RGBA')
-                background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                img = background
-            
-            # Extract text with optimized configuration
-            text = pytesseract.image_to_string(img, config=OCRConfig.CONFIG)
-            
-            logger.info(f"OCR completed for {image_path.name}: {len(text)} characters extracted")
-            return text.strip()
+        cached_text, memory_key, disk_key = await _get_cached_ocr_text(image_path)
+        if cached_text is not None:
+            logger.info(f"OCR cache hit for {image_path.name}")
+            return cached_text
+
+        loop = asyncio.get_running_loop()
+        pool = get_ocr_pool()
+        rows = min(_TILE_ROWS, _ocr_worker_count())
+        width, height = await asyncio.to_thread(_image_size, image_path)
+
+        if rows > 1 and _should_tile(width, height):
+            boxes = _tile_boxes(width, height, rows)
+            tile_lines = await asyncio.gather(*(
+                loop.run_in_executor(pool, _ocr_tile_lines, str(image_path), box)
+                for box in boxes
+            ))
+            text = _merge_tile_lines(list(zip(boxes, tile_lines)))
+        else:
+            text = await loop.run_in_executor(pool, _ocr_image_file, str(image_path))
+
+        logger.info(f"OCR completed for {image_path.name}: {len(text)} characters extracted")
+        text = text.strip()
+        await _remember_ocr_text(text, memory_key, disk_key)
+        return text
         
     except Exception as e:
         logger.error(f"Error extracting text from {image_path}: {e}")
         return ""
 
+def _ocr_image_list_sync(image_paths: List[Path]) -> List[str]:
+    """Run a single Tesseract process over every image listed in a temp list file"""
+    from PIL import Image
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Same preprocessing as _ocr_image_file: transparent images are flattened onto
+        # white first, into a copy in the work directory
+        listed: List[str] = []
+        for k, path in enumerate(image_paths):
+            with Image.open(path) as img:
+                prepared = _prepare_image(img)
+                if prepared is img:
+                    listed.append(str(path))
+                else:
+                    flattened = os.path.join(work_dir, f"{k}.png")
+                    prepared.save(flattened)
+                    listed.append(flattened)
+
+        list_path = os.path.join(work_dir, "images.txt")
+        with open(list_path, "w") as list_file:
+            list_file.write("\n".join(listed))
+
+        result = subprocess.run(
+            ["tesseract", list_path, "-", *OCRConfig.CONFIG.split()],
+            capture_output=True,
+            text=True,
+        )
+
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"tesseract exited with {result.returncode}")
+
+    # Tesseract terminates each page with a form feed; multi-frame files (TIFF/GIF)
+    # would break the page-to-image mapping, so bail out and let the caller retry
+    pages = result.stdout.split("\x0c")[:-1]
+    if len(pages) != len(image_paths):
+        raise RuntimeError(f"expected {len(image_paths)} pages from tesseract, got {len(pages)}")
+    return [page.strip() for page in pages]
+
+async def extract_text_from_images_batch(image_paths: List[Path]) -> List[str]:
+    """Extract text from several images with one Tesseract invocation, preserving order"""
+    lookups = await asyncio.gather(*(_get_cached_ocr_text(path) for path in image_paths))
+    texts = [cached_text or "" for cached_text, _, _ in lookups]
+    pending = [i for i, (cached_text, _, _) in enumerate(lookups) if cached_text is None]
+    if not pending:
+        return texts
+
+    try:
+        ocr_texts = await asyncio.to_thread(_ocr_image_list_sync, [image_paths[i] for i in pending])
+    except Exception as e:
+        logger.error(f"Batch OCR failed, falling back to per-image OCR: {e}")
+        for i in pending:
+            texts[i] = await extract_text_from_image(image_paths[i])
+        return texts
+
+    for i, text in zip(pending, ocr_texts):
+        _, memory_key, disk_key = lookups[i]
+        await _remember_ocr_text(text, memory_key, disk_key)
+        texts[i] = text
+    logger.info(f"Batch OCR completed for {len(pending)} images: {sum(len(texts[i]) for i in pending)} characters extracted")
+    return texts
+
 def cleanup_file(file_path: Path) -> None:
     """Safely delete a file after processing"""
     try:
-        if file_path.exists():
-            file_path.unlink()
-            logger.info(f"Cleaned up file: {file_path}")
+        file_path.unlink()
+        logger.info(f"Cleaned up file: {file_path}")
+    except FileNotFoundError:
+        pass
     except Exception as e:
         logger.warning(f"Failed to delete {file_path}: {e}")
+
 def cleanup_files(file_paths: List[Path]) -> None:
     """Delete multiple files after processing"""
     for file_path in file_paths:
         cleanup_file(file_path)
 
+async def cleanup_files_async(file_paths: List[Path]) -> None:
+    """Delete multiple files concurrently without blocking the event loop"""
+    await asyncio.gather(*(asyncio.to_thread(cleanup_file, file_path) for file_path in file_paths))
+
+
+def _upload_fileno(source: BinaryIO) -> Optional[int]:
+    """Return the OS file descriptor behind an upload, or None if it only lives in memory"""
+    # SpooledTemporaryFile keeps small uploads in a BytesIO; calling fileno() would force a rollover
+    inner = getattr(source, "_file", source)
+    if isinstance(inner, io.BytesIO):
+        return None
+    try:
+        return inner.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+# Chunk size for user-space upload copies (shutil's default is 64 KiB)
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+def _kernel_copy_strategies() -> List[Callable[[int, int, int, int], int]]:
+    """In-kernel file-to-file copy primitives available on this platform, fastest first"""
+    strategies: List[Callable[[int, int, int, int], int]] = []
+    if hasattr(os, "copy_file_range"):
+        strategies.append(lambda src_fd, dst_fd, offset, count: os.copy_file_range(src_fd, dst_fd, count, offset))
+    if hasattr(os, "sendfile"):
+        strategies.append(lambda src_fd, dst_fd, offset, count: os.sendfile(dst_fd, src_fd, offset, count))
+    return strategies
+
+def _kernel_copy(src_fd: int, dst_fd: int) -> bool:
+    """Copy a whole file between descriptors without going through user space"""
+    size = os.fstat(src_fd).st_size
+    for copy_range in _kernel_copy_strategies():
+        offset = 0
+        try:
+            while offset < size:
+                copied = copy_range(src_fd, dst_fd, offset, size - offset)
+                if copied == 0:
+                    break
+                offset += copied
+            return True
+        except OSError:
+            # Unsupported for this pair of files (e.g. cross-device, or macOS sendfile
+            # only writing to sockets); reset the destination and try the next strategy
+            os.lseek(dst_fd, 0, os.SEEK_SET)
+            os.ftruncate(dst_fd, 0)
+    return False
+
+def _write_upload_sync(source: BinaryIO, file_path: Path) -> int:
+    """Copy an upload to disk, staying in the kernel when the upload is backed by a file"""
+    source.seek(0)
+    with file_path.open("wb") as buffer:
+        src_fd = _upload_fileno(source)
+        if src_fd is None or not _kernel_copy(src_fd, buffer.fileno()):
+            source.seek(0)
+            shutil.copyfileobj(source, buffer, length=_COPY_CHUNK_SIZE)
+    return file_path.stat().st_size
 
 async def save_uploaded_image(image: UploadFile) -> Tuple[Path, str]:
     """Save uploaded image with validation and return file path and URL"""
@@ -134,22 +515,18 @@ async def save_uploaded_image(image: UploadFile) -> Tuple[Path, str]:
         
         # Generate unique filename
         file_extension = Path(image.filename).suffix.lower()
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
+        unique_filename = f"{uuid.uuid4().hex}{file_extension}"
         file_path = upload_dir / unique_filename
         
-        # Save file
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(image.file, buffer)
+        # Save file off the event loop
+        saved_size = await asyncio.to_thread(_write_upload_sync, image.file, file_path)
         
         # Verify file was saved correctly
-        if not file_path.exists() or file_path.stat().st_size == 0:
+        if saved_size == 0:
             raise HTTPException(status_code=500, detail="Failed to save image file")
         
-        # Small delay to ensure file system operations complete
-        await asyncio.sleep(0.1)
-        
         image_url = f"/uploads/{unique_filename}"
-        logger.info(f"Saved image: {unique_filename} ({file_path.stat().st_size} bytes)")
+        logger.info(f"Saved image: {unique_filename} ({saved_size} bytes)")
         
         return file_path, image_url
         
@@ -249,30 +626,54 @@ async def process_multiple_recipe_images(
 
         else:
             # Multiple images with proper ordering context
-            image_texts = []
-
-            for i, image in enumerate(images):
-                # Rate limiting between images
-                if i > 0:
-                    await asyncio.sleep(0.3)
-
-                logger.info(f"Processing image {i+1}/{len(images)}: {image.filename}")
-                pct = 15 + int(35 * (i + 1) / max(len(images), 1))
-                await emit("scraping", f"OCR image {i + 1} of {len(images)}…", pct)
-
-                # Save and process image
+            file_paths: List[Optional[Path]] = [None] * len(images)
+            image_urls: List[Optional[str]] = [None] * len(images)
+            pipeline_ocr = _ocr_worker_count() > 1
+            ocr_done = 0
+
+            async def report_ocr(count: int) -> None:
+                nonlocal ocr_done
+                ocr_done += count
+                pct = 15 + int(35 * ocr_done / len(images))
+                await emit("scraping", f"OCR image {ocr_done} of {len(images)}…", pct)
+
+            async def save_image(i: int, image: UploadFile) -> str:
+                logger.info(f"Saving image {i+1}/{len(images)}: {image.filename}")
                 file_path, image_url = await save_uploaded_image(image)
                 saved_files.append(file_path)
+                file_paths[i] = file_path
+                image_urls[i] = image_url
+
+                if pipeline_ocr:
+                    # Start OCR on this image while the remaining uploads are still being written
+                    text = await extract_text_from_image(file_path)
+                    await report_ocr(1)
+                    return text
+                return ""
+
+            await emit("scraping", f"Running OCR on {len(images)} images…", 15)
+            results = await asyncio.gather(
+                *(save_image(i, image) for i, image in enumerate(images)),
+                return_exceptions=True,
+            )
+            for outcome in results:
+                if isinstance(outcome, BaseException):
+                    raise outcome
 
-                # Extract text
-                extracted_text = await extract_text_from_image(file_path)
-
-                if extracted_text:
-                    image_texts.append(f"--- Image {i+1} ---\n{extracted_text}")
+            # Use first image as primary
+            primary_image_url = image_urls[0]
 
-                # Use first image as primary
-                if i == 0:
-                    primary_image_url = image_url
+            if pipeline_ocr:
+                extracted_texts = results
+            else:
+                # One Tesseract process for all pages avoids paying engine init per image
+                extracted_texts = await extract_text_from_images_batch(file_paths)
+                await report_ocr(len(images))
+            image_texts = [
+                f"--- Image {i+1} ---\n{text}"
+                for i, text in enumerate(extracted_texts)
+                if text
+            ]
 
             # Combine all text with proper context
             if image_texts:
@@ -292,9 +693,6 @@ async def process_multiple_recipe_images(
         
         logger.info(f"Total extracted text: {len(combined_text)} characters")
 
-        # Process with AI after brief delay
-        await asyncio.sleep(0.5)
-
         await emit("ai", "Structuring with AI…", 62)
 
         # Generate source info
@@ -319,19 +717,19 @@ async def process_multiple_recipe_images(
             if background_tasks is not None:
                 background_tasks.add_task(cleanup_files, saved_files)
             else:
-                cleanup_files(saved_files)
+                await cleanup_files_async(saved_files)
 
         await emit("completed", "Imported", 100)
         return result
 
     except HTTPException:
         # Clean up on known errors
-        cleanup_files(saved_files)
+        await cleanup_files_async(saved_files)
         raise
 
     except Exception as e:
         # Clean up on unexpected errors
-        cleanup_files(saved_files)
+        await cleanup_files_async(saved_files)
         logger.error(f"Unexpected error processing images: {e}")
         raise HTTPException(
             status_code=500, detail="An unexpected error occurred during image processing"
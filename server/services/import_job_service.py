@@ -34,7 +34,7 @@ class ImportJobService:
         self._max_jobs = max_jobs
 
     async def create_job(self) -> str:
-        job_id = str(uuid.uuid4())
+        job_id = uuid.uuid4().hex
         now = time.time()
         async with self._lock:
             self._evict_if_needed_unlocked()
@@ -7,10 +7,10 @@ which provides reliable, maintained scrapers that handle Instagram's anti-bot me
 
 import re
 import os
-import json
 import asyncio
-import random
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 ProgressCb = Optional[Callable[[str, str, int], Awaitable[None]]]
 from apify_client import ApifyClientAsync
@@ -28,6 +28,44 @@ logger = setup_logger(__name__)
 # Apify actor for Instagram scraping (popular public actor)
 INSTAGRAM_ACTOR = os.getenv("APIFY_ACTOR", "apify/instagram-post-scraper")
 
+# Cap (seconds) on an actor run; Apify aborts the run itself once it is exceeded. Cold
+# starts of the actor container alone can take tens of seconds.
+APIFY_CALL_TIMEOUT = int(os.getenv("APIFY_CALL_TIMEOUT", "180"))
+# Extra time to wait beyond the run cap, so Apify can report the run's final status
+_APIFY_WAIT_MARGIN_SECS = 15
+
+# Responses for actor runs that ended (or are still going) without results
+_RUN_TIMED_OUT_ERROR = {
+    "error": "Scraping timed out",
+    "message": "The Instagram scraper took too long to respond.",
+    "suggestion": "Try again later or check if the Instagram post is publicly accessible."
+}
+_RUN_STATUS_ERRORS = {
+    "TIMING-OUT": _RUN_TIMED_OUT_ERROR,
+    "TIMED-OUT": _RUN_TIMED_OUT_ERROR,
+    "FAILED": {
+        "error": "Scraping failed",
+        "message": "The Instagram scraper run failed.",
+        "suggestion": "Try again later; if it keeps failing, check the actor run log in the Apify console."
+    },
+    "ABORTING": {
+        "error": "Scraping aborted",
+        "message": "The Instagram scraper run was aborted before it finished.",
+        "suggestion": "Try again later."
+    },
+    "ABORTED": {
+        "error": "Scraping aborted",
+        "message": "The Instagram scraper run was aborted before it finished.",
+        "suggestion": "Try again later."
+    },
+}
+# Statuses of a run that was still going when the wait ended
+_RUN_ACTIVE_STATUSES = ("READY", "RUNNING")
+
+# Instagram post/reel/TV URL patterns, compiled once at import
+_SHORTCODE_RE = re.compile(r'instagram\.com/(?:p|reel|tv)/([A-Za-z0-9_-]+)')
+_VALID_URL_RE = re.compile(r'https?://(?:www\.)?instagram\.com/(?:p|reel|tv)/[A-Za-z0-9_-]+')
+
 # Global Apify client instance
 _apify_client = None
 
@@ -62,28 +100,31 @@ def extract_apify_video_url(post_data: Dict[str, Any]) -> Optional[str]:
     return None
 
 
+def _is_shortcode(code: str) -> bool:
+    return bool(code) and code.isascii() and code.replace('_', '').replace('-', '').isalnum()
+
 def extract_instagram_shortcode(url: str) -> Optional[str]:
     """Extract shortcode from Instagram URL"""
-    # Match various Instagram URL patterns and extract shortcode
-    patterns = [
-        r'instagram\.com/p/([A-Za-z0-9_-]+)',
-        r'instagram\.com/reel/([A-Za-z0-9_-]+)',
-        r'instagram\.com/tv/([A-Za-z0-9_-]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
+    # Post URLs have a fixed shape, so plain string splitting handles the usual case
+    for kind in ('/p/', '/reel/', '/tv/'):
+        head, sep, tail = url.partition(kind)
+        if sep and head.endswith('instagram.com'):
+            code = tail.split('/', 1)[0].split('?', 1)[0].split('#', 1)[0]
+            if _is_shortcode(code):
+                return code
+            break
     
-    return None
+    # Fall back to the regex for anything unusual
+    match = _SHORTCODE_RE.search(url)
+    return match.group(1) if match else None
 
-async def scrape_instagram_post(url: str) -> Dict[str, Any]:
+async def scrape_instagram_post(url: str, shortcode: Optional[str] = None) -> Dict[str, Any]:
     """
     Scrape Instagram post using Apify async client
     
     Args:
         url: Instagram post URL
+        shortcode: Shortcode already extracted from the URL, if the caller has it
         
     Returns:
         Dict containing scraped post data or error information
@@ -95,7 +136,7 @@ async def scrape_instagram_post(url: str) -> Dict[str, Any]:
         client = get_apify_client()
         
         # Extract shortcode for validation
-        shortcode = extract_instagram_shortcode(url)
+        shortcode = shortcode or extract_instagram_shortcode(url)
         if not shortcode:
             return {
                 "error": "Invalid Instagram URL format",
@@ -114,11 +155,30 @@ async def scrape_instagram_post(url: str) -> Dict[str, Any]:
         
         # Run the actor and get the results
         actor_client = client.actor(INSTAGRAM_ACTOR)
-        run_result = await actor_client.call(run_input=run_input)
+        # Bound the run on Apify's side too, so a timed-out run stops instead of billing on
+        run_result = await actor_client.call(
+            run_input=run_input,
+            timeout_secs=APIFY_CALL_TIMEOUT,
+            wait_secs=APIFY_CALL_TIMEOUT + _APIFY_WAIT_MARGIN_SECS,
+        )
+        status = run_result.get("status") if run_result else None
+        if status in _RUN_ACTIVE_STATUSES:
+            logger.error(f"Apify actor run still {status} after {APIFY_CALL_TIMEOUT}s, aborting it")
+            await client.run(run_result["id"]).abort()
+            return dict(_RUN_TIMED_OUT_ERROR)
+        if status in _RUN_STATUS_ERRORS:
+            logger.error(f"Apify actor run ended with status {status}")
+            return dict(_RUN_STATUS_ERRORS[status])
         
-        # Get dataset items from the run
-        run_client = actor_client.last_run()
-        dataset_data = await run_client.dataset().list_items()
+        if not run_result or not run_result.get("defaultDatasetId"):
+            return {
+                "error": "No data found",
+                "message": "The Instagram scraper run did not produce any results.",
+                "suggestion": "The post may be private, deleted, or temporarily unavailable."
+            }
+        
+        # Fetch only the first item straight from the run's dataset (no extra last_run() lookup)
+        dataset_data = await client.dataset(run_result["defaultDatasetId"]).list_items(limit=1, clean=True)
         
         if not dataset_data.items:
             return {
@@ -133,7 +193,8 @@ async def scrape_instagram_post(url: str) -> Dict[str, Any]:
         
         return {
             "success": True,
-            "data": post_data
+            "data": post_data,
+            "shortcode": shortcode
         }
         
     except Exception as e:
@@ -160,6 +221,158 @@ async def scrape_instagram_post(url: str) -> Dict[str, Any]:
                 "suggestion": "Try again later or check if the Instagram post is publicly accessible."
             }
 
+async def _scrape_and_structure_post(
+    url: str,
+    shortcode: Optional[str],
+    emit: Callable[[str, str, int], Awaitable[None]],
+) -> Dict[str, Any]:
+    """
+    Scrape an Instagram post and structure its caption with AI
+
+    This part does not depend on the requesting user, so concurrent requests
+    for the same post can share it.
+
+    Returns:
+        Dict with "post_data" and "recipe_data" on success, or error information
+    """
+    await emit("scraping", "Scraping Instagram post…", 15)
+    # Scrape the Instagram post
+    scrape_result = await scrape_instagram_post(url, shortcode)
+    
+    if not scrape_result.get("success"):
+        return scrape_result
+    
+    post_data = scrape_result["data"]
+    caption = post_data.get("caption", "")
+    
+    # Validate content
+    if not caption or not caption.strip():
+        return {
+            "error": "No recipe content found",
+            "message": "The Instagram post doesn't contain any caption text with recipe information.",
+            "suggestion": "Make sure the post has recipe details in the caption.",
+            "post_data": {
+                "username": post_data.get("ownerUsername", ""),
+                "likes": post_data.get("likesCount", 0),
+                "comments": post_data.get("commentsCount", 0)
+            }
+        }
+    
+    logger.info(f"Processing {len(caption)} characters with AI")
+
+    await emit("ai", "Structuring caption with AI…", 45)
+    # Process content with AI
+    recipe_data = await process_with_ai(caption)
+    if not recipe_data:
+        return {
+            "error": "Failed to extract recipe information",
+            "message": "The AI couldn't identify recipe content in the post.",
+            "suggestion": "Ensure the post contains clear recipe instructions and ingredients.",
+            "raw_caption": caption[:200] + "..." if len(caption) > 200 else caption
+        }
+    
+    return {
+        "success": True,
+        "shortcode": scrape_result["shortcode"],
+        "post_data": post_data,
+        "recipe_data": recipe_data,
+    }
+
+# Successful scrape + AI results keyed by shortcode; captions don't change, so repeat
+# URLs can skip Apify and the AI call entirely
+_POST_CACHE_TTL_SECONDS = 3600
+_POST_CACHE_MAX_ENTRIES = 1024
+_post_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+def _get_cached_post(shortcode: str) -> Optional[Dict[str, Any]]:
+    entry = _post_cache.get(shortcode)
+    if entry is None:
+        return None
+    expires_at, result = entry
+    if expires_at < time.monotonic():
+        _post_cache.pop(shortcode, None)
+        return None
+    _post_cache.move_to_end(shortcode)
+    return result
+
+def _cache_post(shortcode: str, result: Dict[str, Any]) -> None:
+    _post_cache[shortcode] = (time.monotonic() + _POST_CACHE_TTL_SECONDS, result)
+    _post_cache.move_to_end(shortcode)
+    while len(_post_cache) > _POST_CACHE_MAX_ENTRIES:
+        _post_cache.popitem(last=False)
+
+# In-flight scrape + AI runs keyed by shortcode, so concurrent requests for the
+# same post share one Apify actor run and one AI call
+class _InflightPost:
+    """A shared run: its eventual result, and the progress callbacks of requests that joined it"""
+    __slots__ = ("future", "listeners")
+
+    def __init__(self) -> None:
+        self.future: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        self.listeners: List[Callable[[str, str, int], Awaitable[None]]] = []
+
+class _OwnerCancelled(Exception):
+    """The request running a shared extraction was cancelled; joined requests retry"""
+
+_inflight_posts: Dict[str, _InflightPost] = {}
+
+async def _scrape_and_structure_post_once(
+    url: str,
+    shortcode: str,
+    emit: Callable[[str, str, int], Awaitable[None]],
+) -> Dict[str, Any]:
+    """Run _scrape_and_structure_post, reusing a cached result or joining a run already in flight"""
+    while True:
+        cached = _get_cached_post(shortcode)
+        if cached is not None:
+            logger.info(f"Using cached Instagram extraction for shortcode: {shortcode}")
+            return cached
+        
+        pending = _inflight_posts.get(shortcode)
+        if pending is None:
+            break
+        
+        logger.info(f"Joining in-flight Instagram extraction for shortcode: {shortcode}")
+        pending.listeners.append(emit)
+        try:
+            return await asyncio.shield(pending.future)
+        except _OwnerCancelled:
+            # The run was abandoned; try again, starting a new run if nobody else has
+            logger.info("In-flight Instagram extraction was cancelled, retrying: %s", shortcode)
+        finally:
+            if emit in pending.listeners:
+                pending.listeners.remove(emit)
+    
+    inflight = _InflightPost()
+    _inflight_posts[shortcode] = inflight
+    
+    async def emit_all(stage: str, label: str, pct: int) -> None:
+        await emit(stage, label, pct)
+        for listener in list(inflight.listeners):
+            try:
+                await listener(stage, label, pct)
+            except Exception as e:
+                logger.warning("Progress callback of a joined request failed: %s", e)
+    
+    try:
+        result = await _scrape_and_structure_post(url, shortcode, emit_all)
+        if result.get("success"):
+            _cache_post(shortcode, result)
+        inflight.future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        # Joined requests get an ordinary exception they handle by retrying, not a cancellation
+        inflight.future.set_exception(_OwnerCancelled())
+        inflight.future.exception()
+        raise
+    except BaseException as e:
+        inflight.future.set_exception(e)
+        # Mark the exception as retrieved so it isn't logged again when nobody joined
+        inflight.future.exception()
+        raise
+    finally:
+        _inflight_posts.pop(shortcode, None)
+
 async def get_recipe_from_instagram(
     url: str,
     user_id: Optional[str] = None,
@@ -184,20 +397,19 @@ async def get_recipe_from_instagram(
     try:
         logger.info(f"Starting Instagram recipe extraction for URL: {url}")
 
-        # Add small delay to be respectful
-        await asyncio.sleep(random.uniform(1, 2))
-
-        await emit("scraping", "Scraping Instagram post…", 15)
-        # Scrape the Instagram post
-        scrape_result = await scrape_instagram_post(url)
+        shortcode = extract_instagram_shortcode(url)
+        if shortcode:
+            structured = await _scrape_and_structure_post_once(url, shortcode, emit)
+        else:
+            structured = await _scrape_and_structure_post(url, None, emit)
         
-        if not scrape_result.get("success"):
-            return scrape_result
+        if not structured.get("success"):
+            return structured
         
-        post_data = scrape_result["data"]
+        post_data = structured["post_data"]
+        recipe_data = structured["recipe_data"]
         
         # Extract relevant content from the scraped data
-        caption = post_data.get("caption", "")
         image_url = None
         username = post_data.get("ownerUsername", "")
         
@@ -209,32 +421,6 @@ async def get_recipe_from_instagram(
         elif post_data.get("images") and len(post_data["images"]) > 0:
             image_url = post_data["images"][0]
         
-        # Validate content
-        if not caption or not caption.strip():
-            return {
-                "error": "No recipe content found",
-                "message": "The Instagram post doesn't contain any caption text with recipe information.",
-                "suggestion": "Make sure the post has recipe details in the caption.",
-                "post_data": {
-                    "username": username,
-                    "likes": post_data.get("likesCount", 0),
-                    "comments": post_data.get("commentsCount", 0)
-                }
-            }
-        
-        logger.info(f"Processing {len(caption)} characters with AI")
-
-        await emit("ai", "Structuring caption with AI…", 45)
-        # Process content with AI
-        recipe_data = await process_with_ai(caption)
-        if not recipe_data:
-            return {
-                "error": "Failed to extract recipe information",
-                "message": "The AI couldn't identify recipe content in the post.",
-                "suggestion": "Ensure the post contains clear recipe instructions and ingredients.",
-                "raw_caption": caption[:200] + "..." if len(caption) > 200 else caption
-            }
-        
         await emit("saving", "Saving to your library…", 78)
         # Save to database
         source_info = f"Instagram: @{username} - {url}" if username else f"Instagram: {url}"
@@ -289,7 +475,7 @@ async def get_recipe_from_instagram(
                 "likes": post_data.get("likesCount", 0),
                 "comments": post_data.get("commentsCount", 0),
                 "timestamp": post_data.get("timestamp"),
-                "shortcode": extract_instagram_shortcode(url),
+                "shortcode": structured["shortcode"],
             },
         }
 
@@ -309,14 +495,12 @@ def validate_instagram_url(url: str) -> bool:
     if not url or not isinstance(url, str):
         return False
     
-    # Check for Instagram domain and valid post patterns
-    instagram_patterns = [
-        r'https?://(?:www\.)?instagram\.com/p/[A-Za-z0-9_-]+',
-        r'https?://(?:www\.)?instagram\.com/reel/[A-Za-z0-9_-]+', 
-        r'https?://(?:www\.)?instagram\.com/tv/[A-Za-z0-9_-]+',
-    ]
+    # Cheap substring test rejects non-Instagram URLs before the regex runs
+    if 'instagram.com' not in url:
+        return False
     
-    return any(re.match(pattern, url.strip()) for pattern in instagram_patterns)
+    # Check for Instagram domain and valid post patterns
+    return bool(_VALID_URL_RE.match(url.strip()))
 
 async def get_apify_status() -> Dict[str, Any]:
     """Get the current Apify service status"""
@@ -369,47 +553,45 @@ async def apify_setup_guide():
         
     if status.get('user_info'):
         user_info = status['user_info']
-        print(f"   Account: {user_info.get('username', 'N/A')} ({user_info.get('email', 'N/A')})")
+        logger.info("   Account: %s (%s)", user_info.get('username', 'N/A'), user_info.get('email', 'N/A'))
     
-    print("\n4. ALTERNATIVE ACTORS:")
-    print("   - Current: apify/instagram-post-scraper")
-    print("   - Alternative: dtrungtin/instagram-scraper")
-    print("   - Browse more at: https://apify.com/store")
+    logger.info("4. ALTERNATIVE ACTORS:")
+    logger.info("   - Current: apify/instagram-post-scraper")
+    logger.info("   - Alternative: dtrungtin/instagram-scraper")
+    logger.info("   - Browse more at: https://apify.com/store")
     
-    print("\n⚠️  Important Notes:")
-    print("   - Keep your API token secure")
-    print("   - Monitor your usage and costs")
-    print("   - Some posts may still require authentication")
-    print("   - Respect Instagram's terms of service")
-    print("=" * 60)
+    logger.info("⚠️  Important Notes:")
+    logger.info("   - Keep your API token secure")
+    logger.info("   - Monitor your usage and costs")
+    logger.info("   - Some posts may still require authentication")
+    logger.info("   - Respect Instagram's terms of service")
 
 # Helper function to test a specific Instagram URL
 async def test_instagram_extraction(url: str) -> Dict[str, Any]:
     """Test Instagram extraction with a specific URL"""
-    print(f"\n🧪 Testing Instagram extraction for: {url}")
-    print("-" * 50)
+    logger.info("🧪 Testing Instagram extraction for: %s", url)
     
     if not validate_instagram_url(url):
-        print("❌ Invalid Instagram URL format")
+        logger.info("❌ Invalid Instagram URL format")
         return {"error": "Invalid URL"}
     
     try:
         result = await get_recipe_from_instagram(url)
         
         if result.get("success"):
-            print("✅ Extraction successful!")
-            print(f"   Title: {result.get('title', 'N/A')}")
-            print(f"   Username: @{result.get('username', 'N/A')}")
-            print(f"   Ingredients: {len(result.get('ingredients', []))} items")
-            print(f"   Instructions: {len(result.get('instructions', []))} steps")
-            print(f"   Likes: {result.get('instagram_data', {}).get('likes', 0)}")
+            logger.info("✅ Extraction successful!")
+            logger.info("   Title: %s", result.get('title', 'N/A'))
+            logger.info("   Username: @%s", result.get('username', 'N/A'))
+            logger.info("   Ingredients: %d items", len(result.get('ingredients', [])))
+            logger.info("   Instructions: %d steps", len(result.get('instructions', [])))
+            logger.info("   Likes: %s", result.get('instagram_data', {}).get('likes', 0))
         else:
-            print("❌ Extraction failed:")
-            print(f"   Error: {result.get('error', 'Unknown error')}")
-            print(f"   Message: {result.get('message', 'No details available')}")
+            logger.info("❌ Extraction failed:")
+            logger.info("   Error: %s", result.get('error', 'Unknown error'))
+            logger.info("   Message: %s", result.get('message', 'No details available'))
             
         return result
         
     except Exception as e:
-        print(f"❌ Test failed with exception: {e}")
+        logger.info("❌ Test failed with exception: %s", e)
         return {"error": str(e)}
@@ -1,6 +1,7 @@
 """
 Download remote video (e.g. Instagram CDN) and upload to Cloudflare R2 or Supabase Storage.
 """
+import asyncio
 from typing import Optional
 
 import httpx
@@ -15,6 +16,28 @@ logger = setup_logger(__name__)
 VIDEO_BUCKET = "recipe-videos"
 MAX_VIDEO_BYTES = 50 * 1024 * 1024  # 50 MB per-file safety limit
 
+# Shared HTTP client so video downloads reuse pooled keep-alive connections to the CDN
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get or create the shared video download client"""
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(timeout=120.0, follow_redirects=True)
+
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared video download client (called on app shutdown)"""
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 def _content_type_for_extension(ext: str) -> str:
     ext = ext.lower().lstrip(".")
@@ -68,12 +91,14 @@ async def upload_recipe_video_bytes(
         bucket = supabase.storage.from_(VIDEO_BUCKET)
         ctype = _content_type_for_extension(file_extension)
 
+        # The Supabase storage client is synchronous; keep its HTTP calls off the event loop
         try:
             try:
-                bucket.remove([path])
+                await asyncio.to_thread(bucket.remove, [path])
             except Exception:
                 pass
-            bucket.upload(
+            await asyncio.to_thread(
+                bucket.upload,
                 path,
                 data,
                 file_options={
@@ -111,11 +136,10 @@ async def download_and_store_recipe_video(
         return None
 
     try:
-        async with httpx.AsyncClient(timeout=120.0, follow_redirects=True) as client:
-            resp = await client.get(source_video_url)
-            resp.raise_for_status()
-            data = resp.content
-            ct = (resp.headers.get("content-type") or "").split(";")[0].strip().lower()
+        resp = await get_http_client().get(source_video_url)
+        resp.raise_for_status()
+        data = resp.content
+        ct = (resp.headers.get("content-type") or "").split(";")[0].strip().lower()
 
         ext = "mp4"
         if "webm" in ct:
@@ -136,6 +160,8 @@ async def set_recipe_video_url(recipe_id: str, video_url: str) -> None:
     if not supabase or not video_url:
         return
     try:
-        supabase.table("recipes").update({"video_url": video_url}).eq("id", recipe_id).execute()
+        await asyncio.to_thread(
+            supabase.table("recipes").update({"video_url": video_url}).eq("id", recipe_id).execute
+        )
     except Exception as e:
         logger.error("Failed to update recipe video_url: %s", e)
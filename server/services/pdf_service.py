@@ -2,36 +2,80 @@
 PDF Service - Extract recipes from PDF files
 
 This service handles PDF recipe extraction using:
-- PyPDF2 for text-based PDFs
+- PyPDF2 for text-based PDFs (PyMuPDF instead, when it is installed)
 - pdf2image + Tesseract OCR for scanned/image-based PDFs
 - AI processing for recipe data extraction
 """
 
-import io
+import asyncio
+import importlib.util
 import os
 import tempfile
-from typing import Any, Awaitable, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 ProgressCb = Optional[Callable[[str, str, int], Awaitable[None]]]
 from fastapi import UploadFile, BackgroundTasks
 
 # PDF processing imports
+try:
+    import fitz  # PyMuPDF (optional, AGPL-3.0; see requirements.txt)
+except ImportError:
+    fitz = None
+
 try:
     import PyPDF2
-    from pdf2image import convert_from_bytes
-    import pytesseract
-    from PIL import Image
-    PDF_DEPENDENCIES_AVAILABLE = True
 except ImportError:
-    PDF_DEPENDENCIES_AVAILABLE = False
+    PyPDF2 = None
 
+# The OCR stack (pdf2image, pytesseract, PIL, tesserocr) is only imported when a page
+# actually needs OCR, so workers that only see text PDFs never load it
+def _module_available(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+_OCR_MODULES = {name: _module_available(name) for name in ("pdf2image", "pytesseract", "PIL")}
+_OCR_AVAILABLE = all(_OCR_MODULES.values())
+
+PDF_DEPENDENCIES_AVAILABLE = (fitz is not None or PyPDF2 is not None) and _OCR_AVAILABLE
+
+from config import OCR_WORKERS
 from services.ai_service import process_with_ai
 from services.db_service import save_recipe_to_db
+from services.image_service import TESSEROCR_AVAILABLE, get_ocr_pool, get_tess_api
+from utils.constants import OCRConfig
 from utils.helpers import setup_logger
 
 # Setup logging
 logger = setup_logger(__name__)
 
+# Pages with less extracted text than this are treated as scans and sent to OCR
+MIN_PAGE_TEXT_CHARS = 50
+
+# Upload chunk size when spooling a PDF to disk
+_UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Pages rendered per pdftoppm call; OCR starts on a batch while the next one renders
+_RENDER_BATCH_PAGES = os.cpu_count() or 1
+
+# Lookup table for Image.point: grayscale -> 1-bit black/white
+_BINARIZE_TABLE = [255 if p > OCRConfig.PDF_BINARIZE_THRESHOLD else 0 for p in range(256)]
+
+async def save_pdf_upload(pdf_file: UploadFile) -> str:
+    """
+    Stream an uploaded PDF to a temporary file
+
+    MuPDF and poppler both read from a path, so the whole file never has to sit in
+    memory. The caller owns the returned path and must remove it.
+    """
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+        try:
+            while chunk := await pdf_file.read(_UPLOAD_CHUNK_SIZE):
+                tmp.write(chunk)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    return tmp.name
+
 async def process_recipe_pdf(
     pdf_file: UploadFile,
     background_tasks: BackgroundTasks = None,
@@ -47,6 +91,37 @@ async def process_recipe_pdf(
         user_id: Optional user ID for database association
         on_progress: Optional async callback (stage_key, label, percent).
 
+    Returns:
+        Dict containing extracted recipe data or error information
+    """
+    if on_progress:
+        await on_progress("fetching", "Reading PDF…", 10)
+    try:
+        pdf_path = await save_pdf_upload(pdf_file)
+    except Exception as e:
+        logger.error(f"Failed to save uploaded PDF: {e}")
+        return {
+            "error": "PDF processing failed",
+            "message": f"An unexpected error occurred: {e}",
+            "suggestion": "Try again with a different PDF file or use the image upload feature."
+        }
+    return await process_recipe_pdf_file(pdf_path, pdf_file.filename, user_id, on_progress)
+
+async def process_recipe_pdf_file(
+    pdf_path: str,
+    filename: Optional[str],
+    user_id: Optional[str] = None,
+    on_progress: ProgressCb = None,
+) -> Dict[str, Any]:
+    """
+    Extract a recipe from a PDF already saved to disk (see save_pdf_upload)
+
+    Args:
+        pdf_path: Path of the saved PDF; it is deleted once processing ends
+        filename: Original upload filename, for the recipe source and file info
+        user_id: Optional user ID for database association
+        on_progress: Optional async callback (stage_key, label, percent).
+
     Returns:
         Dict containing extracted recipe data or error information
     """
@@ -55,31 +130,54 @@ async def process_recipe_pdf(
         if on_progress:
             await on_progress(stage, label, pct)
 
-    if not PDF_DEPENDENCIES_AVAILABLE:
-        return {
-            "error": "PDF processing not available",
-            "message": "Required PDF processing libraries are not installed. Please install: PyPDF2, pdf2image, pytesseract",
-            "suggestion": "Install with: pip install PyPDF2 pdf2image pytesseract"
-        }
-    
     try:
-        logger.info(f"Starting PDF processing for file: {pdf_file.filename}")
+        if not PDF_DEPENDENCIES_AVAILABLE:
+            return {
+                "error": "PDF processing not available",
+                "message": "Required PDF processing libraries are not installed. Please install: PyPDF2, pdf2image, pytesseract",
+                "suggestion": "Install with: pip install PyPDF2 pdf2image pytesseract"
+            }
 
-        await emit("fetching", "Reading PDF…", 10)
-        # Read PDF file content
-        pdf_content = await pdf_file.read()
+        logger.info(f"Starting PDF processing for file: {filename}")
+        pdf_size = os.stat(pdf_path).st_size
 
         await emit("parsing", "Extracting text from PDF…", 28)
         # Try text extraction first (faster for text-based PDFs)
-        extracted_text = await extract_text_from_pdf(pdf_content)
+        page_texts = await extract_text_from_pdf(pdf_path)
 
-        # If text extraction yields poor results, try OCR
-        if not extracted_text or len(extracted_text.strip()) < 50:
-            logger.info("Text extraction yielded minimal content, attempting OCR")
+        # Only OCR the pages that text extraction couldn't read; if the text layer
+        # couldn't be parsed at all, OCR the whole document
+        if page_texts:
+            ocr_pages = [i for i, text in enumerate(page_texts) if len(text.strip()) < MIN_PAGE_TEXT_CHARS]
+        else:
+            ocr_pages = None
+
+        extraction_method = "text"
+
+        if ocr_pages is None or ocr_pages:
+            logger.info(
+                f"Text extraction yielded minimal content on "
+                f"{'all' if ocr_pages is None else len(ocr_pages)} page(s), attempting OCR"
+            )
             await emit("scraping", "Running OCR on scanned pages…", 40)
-            extracted_text = await extract_text_via_ocr(pdf_content)
+            # A scanned page can hold ingredients or steps the text layer lacks, so the AI
+            # only ever sees the merged text once OCR has finished
+            ocr_texts = await extract_text_via_ocr(pdf_path, ocr_pages)
+            if ocr_pages is None:
+                page_texts = ocr_texts
+            else:
+                for i, text in zip(ocr_pages, ocr_texts):
+                    if len(text.strip()) > len(page_texts[i].strip()):
+                        page_texts[i] = text
+
+            if ocr_pages is None or len(ocr_pages) == len(page_texts):
+                extraction_method = "ocr"
+            else:
+                extraction_method = "mixed"
 
-        if not extracted_text or not extracted_text.strip():
+        extracted_text = _join_page_texts(page_texts)
+
+        if not extracted_text:
             return {
                 "error": "No text found in PDF",
                 "message": "The PDF file doesn't contain any readable text or images with text.",
@@ -101,7 +199,7 @@ async def process_recipe_pdf(
         
         await emit("saving", "Saving to your library…", 85)
         # Save to database
-        source_info = f"PDF: {pdf_file.filename}"
+        source_info = f"PDF: {filename}"
         recipe_id = await save_recipe_to_db(recipe_data, source_info, None, user_id)
         
         if not recipe_id:
@@ -130,9 +228,9 @@ async def process_recipe_pdf(
             "source": "pdf",
             "extracted_via": "pdf_processor",
             "file_info": {
-                "filename": pdf_file.filename,
-                "size_bytes": len(pdf_content),
-                "extraction_method": "text" if len(extracted_text) > 50 else "ocr"
+                "filename": filename,
+                "size_bytes": pdf_size,
+                "extraction_method": extraction_method
             }
         }
         
@@ -145,106 +243,198 @@ async def process_recipe_pdf(
             "message": f"An unexpected error occurred: {error_msg}",
             "suggestion": "Try again with a different PDF file or use the image upload feature."
         }
+    finally:
+        try:
+            os.unlink(pdf_path)
+        except FileNotFoundError:
+            pass
+
+def _join_page_texts(page_texts: List[str]) -> str:
+    """Join the non-empty page texts in page order"""
+    # Single pass: each page is stripped once and the result joined in one allocation
+    return "\n".join(filter(None, (text.strip() for text in page_texts)))
 
-async def extract_text_from_pdf(pdf_content: bytes) -> str:
+async def extract_text_from_pdf(pdf_path: str) -> List[str]:
     """
-    Extract text from PDF using PyPDF2
+    Extract text from PDF using PyMuPDF when installed, otherwise PyPDF2
     
     Args:
-        pdf_content: PDF file content as bytes
+        pdf_path: Path to the PDF file
         
     Returns:
-        Extracted text string
+        Extracted text for each page, in page order (empty list on failure)
     """
     try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
-        text = ""
+        if fitz is not None:
+            # MuPDF's plain "text" mode is its fastest extractor and matches PyPDF2's output
+            with fitz.open(pdf_path, filetype="pdf") as doc:
+                return [page.get_text("text") for page in doc]
         
-        for page_num in range(len(pdf_reader.pages)):
-            page = pdf_reader.pages[page_num]
-            text += page.extract_text() + "\n"
+        pdf_reader = PyPDF2.PdfReader(pdf_path)
         
-        return text.strip()
+        # Iterate the pages directly; indexing pdf_reader.pages walks the page tree each time
+        return [page.extract_text() or "" for page in pdf_reader.pages]
         
     except Exception as e:
         logger.warning(f"Text extraction failed: {e}")
-        return ""
+        return []
+
+def _ocr_page_image(image) -> str:
+    """Binarize a grayscale page render and OCR it (runs in an OCR pool worker)"""
+    if image.mode != 'L':
+        image = image.convert('L')
+    image = image.point(_BINARIZE_TABLE, mode='1')
+    if TESSEROCR_AVAILABLE:
+        api = get_tess_api(lstm_only=True)
+        api.SetImage(image)
+        return api.GetUTF8Text()
+    
+    import pytesseract
+    return pytesseract.image_to_string(image, lang='eng', config=OCRConfig.PDF_CONFIG)
+
+def _ocr_page_file(image_path: str) -> str:
+    """OCR one rendered page file; top-level so it can run in the OCR process pool"""
+    from PIL import Image
+    
+    with Image.open(image_path) as image:
+        return _ocr_page_image(image)
+
+def _page_runs(page_indices: List[int], max_pages: Optional[int] = None) -> List[tuple]:
+    """Group sorted 0-based page indices into contiguous (first, last) runs of at most max_pages"""
+    runs = []
+    for i in page_indices:
+        if runs and runs[-1][1] == i - 1 and (max_pages is None or i - runs[-1][0] < max_pages):
+            runs[-1] = (runs[-1][0], i)
+        else:
+            runs.append((i, i))
+    return runs
 
-async def extract_text_via_ocr(pdf_content: bytes) -> str:
+async def extract_text_via_ocr(pdf_path: str, page_indices: Optional[List[int]] = None) -> List[str]:
     """
     Extract text from PDF using OCR (for scanned PDFs)
     
     Args:
-        pdf_content: PDF file content as bytes
+        pdf_path: Path to the PDF file
+        page_indices: Sorted 0-based pages to OCR; None OCRs every page
         
     Returns:
-        Extracted text string via OCR
+        OCR text for each requested page, in the same order (empty list on failure)
     """
     try:
-        # Convert PDF pages to images
-        images = convert_from_bytes(pdf_content, dpi=150)
+        from pdf2image import convert_from_path, pdfinfo_from_path
+        
+        if page_indices is None:
+            page_count = (await asyncio.to_thread(pdfinfo_from_path, pdf_path))["Pages"]
+            page_indices = list(range(page_count))
+        if not page_indices:
+            return []
+        
+        loop = asyncio.get_running_loop()
+        pool = get_ocr_pool()
+        page_texts = [""] * len(page_indices)
+        
+        # Rendering and OCR overlap: a producer renders pages in batches while consumers
+        # hand each finished page to the OCR process pool. The bounded queue caps how many
+        # rendered pages wait on disk, and each page file is removed once it's been read.
+        consumer_count = max(1, min(OCR_WORKERS, len(page_indices)))
+        queue: asyncio.Queue = asyncio.Queue(maxsize=consumer_count * 2)
         
-        extracted_text = ""
-        for i, image in enumerate(images):
-            logger.info(f"Processing page {i+1} with OCR")
+        with tempfile.TemporaryDirectory() as output_folder:
+            # Grayscale JPEG output is far smaller than the default RGB PPM to hand over to
+            # Tesseract, and workers get file paths rather than pickled images
+            render_options = {
+                'dpi': 150,
+                'grayscale': True,
+                'fmt': 'jpeg',
+                'jpegopt': {'quality': 85, 'optimize': False},
+                'thread_count': os.cpu_count() or 1,
+                'output_folder': output_folder,
+                'paths_only': True,
+            }
+            
+            async def render_pages() -> None:
+                position = 0
+                # Render only the requested pages, one pdftoppm call per batch of a contiguous run
+                for first, last in _page_runs(page_indices, _RENDER_BATCH_PAGES):
+                    render = asyncio.ensure_future(asyncio.to_thread(
+                        convert_from_path,
+                        pdf_path,
+                        first_page=first + 1,
+                        last_page=last + 1,
+                        **render_options,
+                    ))
+                    try:
+                        image_paths = await asyncio.shield(render)
+                    except asyncio.CancelledError:
+                        # pdftoppm keeps writing into output_folder until it exits
+                        await asyncio.wait({render})
+                        raise
+                    for image_path in image_paths:
+                        await queue.put((position, image_path))
+                        position += 1
+                for _ in range(consumer_count):
+                    await queue.put(None)
+            
+            async def ocr_pages() -> None:
+                # Pages are independent, so OCR them across the shared process pool; threads
+                # would just contend on the GIL and a shared engine
+                while (item := await queue.get()) is not None:
+                    position, image_path = item
+                    logger.info(f"Processing page {page_indices[position] + 1} with OCR")
+                    page_texts[position] = await loop.run_in_executor(pool, _ocr_page_file, image_path)
+                    os.unlink(image_path)
             
-            # Use Tesseract to extract text from image
-            page_text = pytesseract.image_to_string(image, lang='eng')
-            extracted_text += f"Page {i+1}:\n{page_text}\n\n"
+            tasks = [asyncio.create_task(render_pages())]
+            tasks.extend(asyncio.create_task(ocr_pages()) for _ in range(consumer_count))
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
         
-        return extracted_text.strip()
+        return page_texts
         
     except Exception as e:
         logger.error(f"OCR extraction failed: {e}")
-        return ""
+        return []
 
-def validate_pdf_dependencies():
-    """
-    Check if all required PDF processing dependencies are available
-    
-    Returns:
-        Dict with dependency status information
-    """
+def _probe_pdf_dependencies() -> Dict[str, Any]:
+    """Check each PDF dependency without importing the OCR stack; installed packages don't change at runtime"""
     dependencies = {
-        "PyPDF2": False,
-        "pdf2image": False,
-        "pytesseract": False,
-        "PIL": False
+        "PyMuPDF": fitz is not None,
+        "PyPDF2": PyPDF2 is not None,
+        **_OCR_MODULES,
     }
     
-    try:
-        import PyPDF2
-        dependencies["PyPDF2"] = True
-    except ImportError:
-        pass
-    
-    try:
-        from pdf2image import convert_from_bytes
-        dependencies["pdf2image"] = True
-    except ImportError:
-        pass
-    
-    try:
-        import pytesseract
-        dependencies["pytesseract"] = True
-    except ImportError:
-        pass
-    
-    try:
-        from PIL import Image
-        dependencies["PIL"] = True
-    except ImportError:
-        pass
-    
-    all_available = all(dependencies.values())
+    # Either text parser will do; PyMuPDF is an optional replacement for PyPDF2
+    text_parser_available = dependencies["PyMuPDF"] or dependencies["PyPDF2"]
+    all_available = text_parser_available and all(
+        available for dep, available in dependencies.items() if dep not in ("PyMuPDF", "PyPDF2")
+    )
     
     return {
         "all_available": all_available,
         "dependencies": dependencies,
-        "missing": [dep for dep, available in dependencies.items() if not available],
+        "missing": [
+            dep for dep, available in dependencies.items()
+            if not available and not (dep in ("PyMuPDF", "PyPDF2") and text_parser_available)
+        ],
         "install_command": "pip install PyPDF2 pdf2image pytesseract Pillow" if not all_available else None
     }
 
+_PDF_DEPENDENCY_STATUS = _probe_pdf_dependencies()
+
+def validate_pdf_dependencies():
+    """
+    Check if all required PDF processing dependencies are available
+    
+    Returns:
+        Dict with dependency status information (computed once at import)
+    """
+    return _PDF_DEPENDENCY_STATUS
+
 async def get_pdf_service_status() -> Dict[str, Any]:
     """
     Get the current PDF service status and capabilities
@@ -257,7 +447,7 @@ async def get_pdf_service_status() -> Dict[str, Any]:
     return {
         "service_available": dependency_status["all_available"],
         "capabilities": {
-            "text_extraction": dependency_status["dependencies"]["PyPDF2"],
+            "text_extraction": dependency_status["dependencies"]["PyMuPDF"] or dependency_status["dependencies"]["PyPDF2"],
             "ocr_extraction": dependency_status["dependencies"]["pdf2image"] and dependency_status["dependencies"]["pytesseract"],
             "image_processing": dependency_status["dependencies"]["PIL"]
         },
@@ -282,9 +472,13 @@ async def test_pdf_processing(pdf_path: str) -> Dict[str, Any]:
                 self.content = content
                 self.filename = filename
                 self.content_type = "application/pdf"
+                self._offset = 0
             
-            async def read(self):
-                return self.content
+            async def read(self, size: int = -1):
+                end = len(self.content) if size < 0 else self._offset + size
+                chunk = self.content[self._offset:end]
+                self._offset += len(chunk)
+                return chunk
         
         mock_file = MockUploadFile(pdf_content, os.path.basename(pdf_path))
         result = await process_recipe_pdf(mock_file)
@@ -1,19 +1,198 @@
-import json
+import asyncio
+import hashlib
+import importlib.util
+import io
+import os
 import re
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 ProgressCb = Optional[Callable[[str, str, int], Awaitable[None]]]
-from urllib.parse import urlparse
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
 from services.instagram_service import get_recipe_from_instagram, validate_instagram_url
 from services.ai_service import process_with_ai
 from services.db_service import save_recipe_to_db
-from utils.helpers import setup_logger
+from utils.constants import RecipeDomains
+from utils.helpers import extract_domain, is_http_url, setup_logger
 import httpx
-from bs4 import BeautifulSoup
+import orjson
+from lxml import etree
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+
+try:
+    from charset_normalizer import from_bytes as detect_charset
+except ImportError:
+    detect_charset = None
 
 # Setup logging
 logger = setup_logger(__name__)
 
+def _css(*selectors: str) -> List[CSSSelector]:
+    return [CSSSelector(selector, translator="html") for selector in selectors]
+
+# Common recipe selectors, compiled to XPath once at import
+_TITLE_SELECTORS = _css('h1.recipe-title', '.recipe-header h1', '.recipe-title', 'h1')
+_INGREDIENT_SELECTORS = _css('.recipe-ingredients li', '.ingredients li', '.recipe-ingredient', '[class*="ingredient"]')
+_INSTRUCTION_SELECTORS = _css('.recipe-instructions li', '.instructions li', '.recipe-instruction', '[class*="instruction"]')
+_MAIN_CONTENT_SELECTORS = _css('main', '.main-content', '.content', 'article', '.recipe')
+_IMAGE_SELECTORS = _css('.recipe-image img', '.recipe-photo img', '.recipe img', '[class*="recipe"] img')
+# cssselect has no case-insensitive attribute flag, so match alt text in XPath
+_RECIPE_ALT_IMAGE_XPATH = etree.XPath('//img[contains(translate(@alt, "RECIPE", "recipe"), "recipe")]')
+_OG_IMAGE_XPATH = etree.XPath('//meta[@property="og:image"]')
+# Text of the JSON-LD blocks as plain strings (no per-result back-reference to the element)
+_JSON_LD_XPATH = etree.XPath('//script[@type="application/ld+json"]/text()', smart_strings=False)
+_ITEMTYPE_XPATH = etree.XPath('//*[@itemtype]')
+_NON_CONTENT_TAGS = ('script', 'style', 'nav', 'header', 'footer', 'aside')
+_GENERAL_CONTENT_MAX_CHARS = 5000
+_PROMINENT_CONTENT_SELECTOR = CSSSelector('main, article, .content, .recipe', translator="html")
+
+# Browser-like request headers for recipe pages. Keep-alive is handled by the client's
+# connection pool (a Connection header is also invalid over HTTP/2).
+_FETCH_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, br, deflate',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Pages at least this large are parsed in a small process pool, created on first use.
+# Below it, pickling the page to a worker and the result back costs more than the parse
+# itself, so ordinary pages are parsed on a thread.
+_PARSE_POOL_MIN_BYTES = 256 * 1024
+_PARSE_POOL_WORKERS = 2
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Get or create the HTML parsing process pool for large pages"""
+    global _parse_pool
+
+    if _parse_pool is None:
+        workers = min(_PARSE_POOL_WORKERS, os.cpu_count() or 1)
+        _parse_pool = ProcessPoolExecutor(max_workers=workers)
+        logger.info(f"Created HTML parse pool with {workers} workers")
+
+    return _parse_pool
+
+def _parse_html_sync(
+    html_content: bytes,
+    structured_only: bool = False,
+    encoding: Optional[str] = None,
+) -> Tuple[Optional[str], Optional[str]]:
+    """Run the extraction strategies on a page; top-level so it can run in the parse pool"""
+    return recipe_extraction_service._extract_page(html_content, structured_only, encoding)
+
+# Encoding declarations libxml2 honours on its own: a BOM, <meta charset> /
+# http-equiv content="...; charset=", or an XML declaration near the top of the page
+_BOMS = (b'\xef\xbb\xbf', b'\xff\xfe', b'\xfe\xff')
+_DECLARED_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=|<\?xml[^>]+encoding\s*=', re.IGNORECASE)
+_CHARSET_SNIFF_BYTES = 4096
+
+def _undeclared_page_encoding(html_content: bytes) -> Optional[str]:
+    """Encoding for a page that declares none; None when the page declares its own"""
+    if html_content.startswith(_BOMS) or _DECLARED_CHARSET_RE.search(html_content, 0, _CHARSET_SNIFF_BYTES):
+        return None
+    # Most undeclared pages are UTF-8 (libxml2 would read them as Latin-1)
+    try:
+        html_content.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    if detect_charset is None:
+        return None
+    best = detect_charset(html_content).best()
+    return best.encoding if best is not None else None
+
+@lru_cache(maxsize=32)
+def _html_parser(encoding: str) -> lxml_html.HTMLParser:
+    """HTML parser that decodes with a known encoding; raises LookupError if libxml2 lacks it"""
+    return lxml_html.HTMLParser(encoding=encoding)
+
+def _is_high_confidence_domain(url: str) -> bool:
+    """Whether the URL is on (a subdomain of) a site with reliable structured recipe data"""
+    domain = extract_domain(url) or ''
+    domain = domain.rsplit('@', 1)[-1].split(':', 1)[0]
+    while domain:
+        if domain in RecipeDomains.HIGH_CONFIDENCE:
+            return True
+        _, _, domain = domain.partition('.')
+    return False
+
+# Structured web recipes keyed by normalized URL, kept for an hour
+_PAGE_CACHE_TTL_SECONDS = 3600
+_PAGE_CACHE_MAX_ENTRIES = 1024
+_page_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+def _normalize_url_for_cache(url: str) -> str:
+    """Lowercase scheme/host, sort the query and drop the fragment"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+def _get_cached_page(cache_key: str) -> Optional[Dict[str, Any]]:
+    entry = _page_cache.get(cache_key)
+    if entry is None:
+        return None
+    expires_at, result = entry
+    if expires_at < time.monotonic():
+        _page_cache.pop(cache_key, None)
+        return None
+    _page_cache.move_to_end(cache_key)
+    return result
+
+def _cache_page(cache_key: str, result: Dict[str, Any]) -> None:
+    _page_cache[cache_key] = (time.monotonic() + _PAGE_CACHE_TTL_SECONDS, result)
+    _page_cache.move_to_end(cache_key)
+    while len(_page_cache) > _PAGE_CACHE_MAX_ENTRIES:
+        _page_cache.popitem(last=False)
+
+# Parse results keyed by a BLAKE2b digest of the page bytes (plus the parse options)
+_CONTENT_CACHE_MAX_ENTRIES = 512
+_ContentKey = Tuple[bytes, bool, Optional[str]]
+_content_cache: "OrderedDict[_ContentKey, Tuple[Optional[str], Optional[str]]]" = OrderedDict()
+
+def _get_cached_page_content(content_key: _ContentKey) -> Optional[Tuple[Optional[str], Optional[str]]]:
+    parsed = _content_cache.get(content_key)
+    if parsed is not None:
+        _content_cache.move_to_end(content_key)
+    return parsed
+
+def _cache_page_content(content_key: _ContentKey, parsed: Tuple[Optional[str], Optional[str]]) -> None:
+    _content_cache[content_key] = parsed
+    _content_cache.move_to_end(content_key)
+    while len(_content_cache) > _CONTENT_CACHE_MAX_ENTRIES:
+        _content_cache.popitem(last=False)
+
+# Shared client so page fetches reuse pooled (and, where supported, HTTP/2 multiplexed) connections
+_web_client: Optional[httpx.AsyncClient] = None
+
+def get_web_client() -> httpx.AsyncClient:
+    """Get or create the shared recipe page client"""
+    global _web_client
+
+    if _web_client is None or _web_client.is_closed:
+        _web_client = httpx.AsyncClient(
+            timeout=30,
+            follow_redirects=True,
+            # HTTP/2 needs the optional h2 package (httpx[http2])
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
+
+    return _web_client
+
+async def close_web_client() -> None:
+    """Close the shared recipe page client (called on app shutdown)"""
+    global _web_client
+
+    if _web_client is not None:
+        await _web_client.aclose()
+        _web_client = None
+
 class RecipeExtractionService:
     """Unified service for extracting recipes from various URL sources"""
     
@@ -62,11 +241,7 @@ class RecipeExtractionService:
     
     def _is_valid_url(self, url: str) -> bool:
         """Validate if the URL has a proper format"""
-        try:
-            result = urlparse(url)
-            return all([result.scheme, result.netloc]) and result.scheme in ['http', 'https']
-        except Exception:
-            return False
+        return is_http_url(url)
     
     async def _extract_from_web_url(
         self,
@@ -81,39 +256,19 @@ class RecipeExtractionService:
                 await on_progress(stage, label, pct)
 
         try:
-            await emit("fetching", "Fetching page…", 12)
-            # Fetch the webpage content
-            html_content = await self._fetch_webpage_content(url)
-            if not html_content:
-                return {"error": "Failed to fetch webpage content or content is empty"}
-
-            await emit("parsing", "Parsing recipe content…", 35)
-            soup = BeautifulSoup(html_content, "html.parser")
-            # Prefer JSON-LD Recipe text when present (one OpenRouter pass on that text).
-            recipe_ld_node = self._first_recipe_dict_from_json_ld_scripts(soup)
-            if recipe_ld_node:
-                recipe_content = self._format_json_ld_recipe(recipe_ld_node)
+            # The fetched, parsed and AI-structured page doesn't depend on the user, so
+            # repeat imports of the same URL reuse it and only the save below runs again
+            cache_key = _normalize_url_for_cache(url)
+            structured = _get_cached_page(cache_key)
+            if structured is not None:
+                logger.info("Using cached web extraction for URL: %s", url)
             else:
-                recipe_content = None
-            if not recipe_content or len(recipe_content.strip()) < 40:
-                recipe_content = await self._extract_recipe_content_from_html(
-                    html_content, url, soup=soup
-                )
-            if not recipe_content:
-                return {"error": "No recipe content found on the webpage"}
-
-            logger.info(
-                "Single OpenRouter pass on scraped content (%s characters)",
-                len(recipe_content),
-            )
-            await emit("ai", "Structuring with AI…", 58)
-            recipe_data = await process_with_ai(recipe_content)
-            if not recipe_data:
-                return {"error": "AI failed to extract recipe information from the content"}
-
-            await emit("cleanup", "Resolving images…", 78)
-            # Extract image URL from the webpage
-            image_url = self._extract_main_image_url(html_content, url)
+                structured = await self._structure_web_page(url, emit)
+                if "error" in structured:
+                    return structured
+                _cache_page(cache_key, structured)
+            recipe_data = structured["recipe_data"]
+            image_url = structured["image_url"]
 
             await emit("saving", "Saving to your library…", 88)
             # Save to database
@@ -146,32 +301,80 @@ class RecipeExtractionService:
             logger.error(f"Error extracting from web URL: {e}")
             return {"error": f"Failed to extract recipe from webpage: {str(e)}"}
     
-    async def _fetch_webpage_content(self, url: str) -> Optional[str]:
-        """Fetch HTML content from a webpage with proper headers and error handling"""
+    async def _structure_web_page(
+        self,
+        url: str,
+        emit: Callable[[str, str, int], Awaitable[None]],
+    ) -> Dict[str, Any]:
+        """Fetch, parse and AI-structure a recipe page: {"recipe_data", "image_url"} or {"error"}"""
+        await emit("fetching", "Fetching page…", 12)
+        # Fetch the webpage content
+        fetched = await self._fetch_webpage_content(url)
+        if not fetched or not fetched[0]:
+            return {"error": "Failed to fetch webpage content or content is empty"}
+        html_content, encoding = fetched
+
+        await emit("parsing", "Parsing recipe content…", 35)
+        # Known structured-data sites skip the CSS-selector heuristics
+        structured_only = _is_high_confidence_domain(url)
+        # Identical HTML (mirrors, CDN duplicates, re-fetches) skips the parse entirely
+        content_key = (hashlib.blake2b(html_content, digest_size=16).digest(), structured_only, encoding)
+        parsed = _get_cached_page_content(content_key)
+        if parsed is None:
+            # Parsing is CPU bound, so it stays off the event loop. Only large pages are
+            # worth shipping to another process (bytes and strings cross the boundary).
+            if len(html_content) >= _PARSE_POOL_MIN_BYTES:
+                loop = asyncio.get_running_loop()
+                parsed = await loop.run_in_executor(
+                    get_parse_pool(), _parse_html_sync, html_content, structured_only, encoding
+                )
+            else:
+                parsed = await asyncio.to_thread(_parse_html_sync, html_content, structured_only, encoding)
+            _cache_page_content(content_key, parsed)
+        recipe_content, image_src = parsed
+        if not recipe_content:
+            return {"error": "No recipe content found on the webpage"}
+
+        logger.info(
+            "Single OpenRouter pass on scraped content (%s characters)",
+            len(recipe_content),
+        )
+        await emit("ai", "Structuring with AI…", 58)
+        recipe_data = await process_with_ai(recipe_content)
+        if not recipe_data:
+            return {"error": "AI failed to extract recipe information from the content"}
+
+        await emit("cleanup", "Resolving images…", 78)
+        image_url = self._resolve_image_url(image_src, url) if image_src else None
+
+        return {"recipe_data": recipe_data, "image_url": image_url}
+    
+    async def _fetch_webpage_content(self, url: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        """Fetch a webpage: (raw HTML bytes, charset from the Content-Type header or None)"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-            
-            async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
-                response = await client.get(url, headers=headers)
-                
+            client = get_web_client()
+            async with client.stream('GET', url, headers=_FETCH_HEADERS, timeout=self.timeout) as response:
                 if response.status_code != 200:
                     logger.warn(f"HTTP {response.status_code} error fetching {url}")
                     return None
                 
-                # Check content length
-                if len(response.content) > self.max_content_length:
-                    logger.warn(f"Content too large: {len(response.content)} bytes")
+                # Reject oversized pages up front when the server says how big they are
+                declared_length = response.headers.get('content-length')
+                if declared_length and declared_length.isdigit() and int(declared_length) > self.max_content_length:
+                    logger.warn(f"Content too large: {declared_length} bytes")
                     return None
                 
-                # Decode content
-                return response.text
+                # Otherwise stop downloading as soon as the decoded body passes the limit
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) > self.max_content_length:
+                        logger.warn(f"Content too large: over {self.max_content_length} bytes")
+                        return None
+                
+                # Hand raw bytes to the parser along with the declared charset, so the
+                # body is decoded once, inside the parse
+                return bytes(body), response.charset_encoding
                 
         except httpx.TimeoutException:
             logger.warn(f"Timeout fetching {url}")
@@ -180,33 +383,60 @@ class RecipeExtractionService:
             logger.error(f"Error fetching webpage: {e}")
             return None
     
-    async def _extract_recipe_content_from_html(
+    def _parse_html(self, html_content: bytes, encoding: Optional[str] = None) -> lxml_html.HtmlElement:
+        """Parse page bytes with libxml2, falling back to BeautifulSoup for markup lxml rejects"""
+        # The HTTP charset wins over anything in the document. Without one, libxml2 reads a
+        # BOM or <meta charset> itself; only pages that declare nothing are detected here,
+        # since libxml2 would silently read them as Latin-1
+        if not encoding:
+            encoding = _undeclared_page_encoding(html_content)
+        parser = None
+        if encoding:
+            try:
+                parser = _html_parser(encoding.lower())
+            except LookupError:
+                logger.warning("Unknown page encoding %r, letting the parser decide", encoding)
+        try:
+            return lxml_html.document_fromstring(html_content, parser=parser)
+        except (etree.ParserError, ValueError):
+            from lxml.html import soupparser
+            return soupparser.fromstring(html_content)
+
+    def _extract_page(
         self,
-        html_content: str,
-        url: str,
-        soup: Optional[BeautifulSoup] = None,
-    ) -> Optional[str]:
-        """Extract recipe content from HTML using multiple strategies"""
+        html_content: bytes,
+        structured_only: bool = False,
+        encoding: Optional[str] = None,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Parse a page once and return (recipe content, main image src as written in the page)"""
+        tree = self._parse_html(html_content, encoding)
+        # Find the image first, before the general-content fallback strips elements out of the tree
+        image_src = self._extract_main_image_src(tree)
+        # JSON-LD Recipe text is tried first (one OpenRouter pass on that text)
+        recipe_content = self._extract_recipe_content_from_tree(tree, structured_only)
+        return recipe_content, image_src
+
+    def _extract_recipe_content_from_tree(self, tree: lxml_html.HtmlElement, structured_only: bool = False) -> Optional[str]:
+        """Extract recipe content from a parsed page, cheapest and most reliable strategy first"""
         try:
-            soup = soup if soup is not None else BeautifulSoup(html_content, "html.parser")
-            
             # Strategy 1: Look for JSON-LD structured data
-            json_ld_content = self._extract_json_ld_recipe(soup)
+            json_ld_content = self._extract_json_ld_recipe(tree)
             if json_ld_content:
                 return json_ld_content
             
             # Strategy 2: Look for microdata recipe markup
-            microdata_content = self._extract_microdata_recipe(soup)
+            microdata_content = self._extract_microdata_recipe(tree)
             if microdata_content:
                 return microdata_content
             
-            # Strategy 3: Look for common recipe selectors
-            selector_content = self._extract_recipe_by_selectors(soup)
-            if selector_content:
-                return selector_content
+            # Strategy 3: Look for common recipe selectors (not worth it on known structured-data sites)
+            if not structured_only:
+                selector_content = self._extract_recipe_by_selectors(tree)
+                if selector_content:
+                    return selector_content
             
-            # Strategy 4: Fallback to general content extraction
-            general_content = self._extract_general_content(soup)
+            # Strategy 4: Fallback to general content extraction; only now is the tree modified
+            general_content = self._extract_general_content(tree)
             if general_content and len(general_content) > 100:
                 return general_content
             
@@ -240,17 +470,17 @@ class RecipeExtractionService:
     def _is_recipe_ld_item(self, item: dict) -> bool:
         return "Recipe" in self._json_ld_types(item)
 
-    def _first_recipe_dict_from_json_ld_scripts(self, soup: BeautifulSoup) -> Optional[dict]:
+    def _first_recipe_dict_from_json_ld_scripts(self, tree: lxml_html.HtmlElement) -> Optional[dict]:
         """First schema.org Recipe object found in application/ld+json blocks (handles @graph)."""
         try:
-            json_scripts = soup.find_all("script", {"type": "application/ld+json"})
-            for script in json_scripts:
-                raw = script.string or script.get_text()
-                if not raw or not str(raw).strip():
+            for raw in _JSON_LD_XPATH(tree):
+                # Only an exact "Recipe" @type matches below, so blocks without that literal
+                # (breadcrumbs, organization, website...) can be skipped without decoding
+                if not raw or '"Recipe"' not in raw:
                     continue
                 try:
-                    data = json.loads(str(raw).strip())
-                except json.JSONDecodeError:
+                    data = orjson.loads(raw.strip())
+                except orjson.JSONDecodeError:
                     continue
                 for item in self._ld_json_dict_items(data):
                     if self._is_recipe_ld_item(item):
@@ -259,10 +489,10 @@ class RecipeExtractionService:
             logger.error(f"Error scanning JSON-LD for Recipe: {e}")
         return None
 
-    def _extract_json_ld_recipe(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_json_ld_recipe(self, tree: lxml_html.HtmlElement) -> Optional[str]:
         """Extract recipe from JSON-LD structured data"""
         try:
-            node = self._first_recipe_dict_from_json_ld_scripts(soup)
+            node = self._first_recipe_dict_from_json_ld_scripts(tree)
             if not node:
                 return None
             return self._format_json_ld_recipe(node)
@@ -273,83 +503,88 @@ class RecipeExtractionService:
     def _format_json_ld_recipe(self, recipe_data: dict) -> str:
         """Format JSON-LD recipe data into readable text"""
         try:
-            content = []
+            # Every section is written with a trailing newline; the last one is dropped below
+            buf = io.StringIO()
+            write = buf.write
             
             # Title
             if recipe_data.get('name'):
-                content.append(f"# {recipe_data['name']}")
+                write(f"# {recipe_data['name']}\n")
             
             # Description
             if recipe_data.get('description'):
-                content.append(f"\n## Description\n{recipe_data['description']}")
+                write(f"\n## Description\n{recipe_data['description']}\n")
             
             # Cook/Prep time
             if recipe_data.get('prepTime') or recipe_data.get('cookTime'):
-                content.append("\n## Timing")
+                write('\n## Timing\n')
                 if recipe_data.get('prepTime'):
-                    content.append(f"Prep Time: {recipe_data['prepTime']}")
+                    write(f"Prep Time: {recipe_data['prepTime']}\n")
                 if recipe_data.get('cookTime'):
-                    content.append(f"Cook Time: {recipe_data['cookTime']}")
+                    write(f"Cook Time: {recipe_data['cookTime']}\n")
             
             # Servings
             if recipe_data.get('recipeYield'):
-                content.append(f"Servings: {recipe_data['recipeYield']}")
+                write(f"Servings: {recipe_data['recipeYield']}\n")
             
             # Ingredients
             if recipe_data.get('recipeIngredient'):
-                content.append("\n## Ingredients")
+                write('\n## Ingredients\n')
                 for ingredient in recipe_data['recipeIngredient']:
-                    content.append(f"- {ingredient}")
+                    write(f"- {ingredient}\n")
             
             # Instructions
             if recipe_data.get('recipeInstructions'):
-                content.append("\n## Instructions")
+                write('\n## Instructions\n')
                 for i, instruction in enumerate(recipe_data['recipeInstructions'], 1):
-                    if isinstance(instruction, dict):
-                        text = instruction.get('text', str(instruction))
-                    else:
-                        text = str(instruction)
-                    content.append(f"{i}. {text}")
+                    # HowToStep text when present; anything else (plain strings, sections)
+                    # is only stringified by the write itself
+                    if isinstance(instruction, dict) and 'text' in instruction:
+                        instruction = instruction['text']
+                    write(f"{i}. {instruction}\n")
             
-            return '\n'.join(content)
+            return buf.getvalue()[:-1]
             
         except Exception as e:
             logger.error(f"Error formatting JSON-LD recipe: {e}")
             return None
     
-    def _extract_microdata_recipe(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_microdata_recipe(self, tree: lxml_html.HtmlElement) -> Optional[str]:
         """Extract recipe from microdata markup"""
         try:
-            # Look for recipe microdata
-            recipe_elem = soup.find(attrs={'itemtype': re.compile(r'.*Recipe.*', re.I)})
-            if not recipe_elem:
+            # Look for recipe microdata (case-insensitive substring test on itemtype)
+            recipe_elem = next(
+                (elem for elem in _ITEMTYPE_XPATH(tree) if 'recipe' in elem.get('itemtype').lower()),
+                None,
+            )
+            if recipe_elem is None:
                 return None
             
             content = []
             
             # Extract title
-            title_elem = recipe_elem.find(attrs={'itemprop': 'name'})
-            if title_elem:
-                content.append(f"# {title_elem.get_text().strip()}")
+            title_elems = recipe_elem.xpath('.//*[@itemprop="name"]')
+            if title_elems:
+                content.append(f"# {title_elems[0].text_content().strip()}")
             
             # Extract description
-            desc_elem = recipe_elem.find(attrs={'itemprop': 'description'})
-            if desc_elem:
-                content.append(f"\n## Description\n{desc_elem.get_text().strip()}")
+            desc_elems = recipe_elem.xpath('.//*[@itemprop="description"]')
+            if desc_elems:
+                content.append(f"\n## Description\n{desc_elems[0].text_content().strip()}")
             
             # Extract ingredients
-            ingredient_elems = recipe_elem.find_all(attrs={'itemprop': 'recipeIngredient'})
+            ingredient_elems = recipe_elem.xpath('.//*[@itemprop="recipeIngredient"]')
             if ingredient_elems:
                 content.append("\n## Ingredients")
                 for elem in ingredient_elems:
-                    content.append(f"- {elem.get_text().strip()}")
+                    content.append(f"- {elem.text_content().strip()}")
             
             # Extract instructions
-            instruction_elems = recipe_elem.find_all(attrs={'itemprop': 'recipeInstructions'})
+            instruction_elems = recipe_elem.xpath('.//*[@itemprop="recipeInstructions"]')
             if instruction_elems:
                 content.append("\n## Instructions")
                 for i, elem in enumerate(instruction_elems, 1):
-                    content.append(f"{i}. {elem.get_text().strip()}")
+                    content.append(f"{i}. {elem.text_content().strip()}")
             
             return '\n'.join(content) if content else None
             
@@ -357,41 +592,36 @@ class RecipeExtractionService:
             logger.error(f"Error extracting microdata: {e}")
             return None
     
-    def _extract_recipe_by_selectors(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_recipe_by_selectors(self, tree: lxml_html.HtmlElement) -> Optional[str]:
         """Extract recipe using common CSS selectors"""
         try:
             content = []
             
-            # Common recipe selectors
-            title_selectors = ['h1.recipe-title', '.recipe-header h1', '.recipe-title', 'h1']
-            ingredient_selectors = ['.recipe-ingredients li', '.ingredients li', '.recipe-ingredient', '[class*="ingredient"]']
-            instruction_selectors = ['.recipe-instructions li', '.instructions li', '.recipe-instruction', '[class*="instruction"]']
-            
             # Extract title
-            for selector in title_selectors:
-                title_elem = soup.select_one(selector)
-                if title_elem and title_elem.get_text().strip():
-                    content.append(f"# {title_elem.get_text().strip()}")
+            for selector in _TITLE_SELECTORS:
+                title_elems = selector(tree)
+                if title_elems and title_elems[0].text_content().strip():
+                    content.append(f"# {title_elems[0].text_content().strip()}")
                     break
             
             # Extract ingredients
-            for selector in ingredient_selectors:
-                ingredients = soup.select(selector)
+            for selector in _INGREDIENT_SELECTORS:
+                ingredients = selector(tree)
                 if ingredients and len(ingredients) > 2:  # At least 3 ingredients
                     content.append("\n## Ingredients")
                     for ing in ingredients[:20]:  # Limit to 20 ingredients
-                        text = ing.get_text().strip()
+                        text = ing.text_content().strip()
                         if text and len(text) > 3:
                             content.append(f"- {text}")
                     break
             
             # Extract instructions
-            for selector in instruction_selectors:
-                instructions = soup.select(selector)
+            for selector in _INSTRUCTION_SELECTORS:
+                instructions = selector(tree)
                 if instructions and len(instructions) > 1:  # At least 2 steps
                     content.append("\n## Instructions")
                     for i, inst in enumerate(instructions[:15], 1):  # Limit to 15 steps
-                        text = inst.get_text().strip()
+                        text = inst.text_content().strip()
                         if text and len(text) > 10:
                             content.append(f"{i}. {text}")
                     break
@@ -402,28 +632,40 @@ class RecipeExtractionService:
             logger.error(f"Error extracting by selectors: {e}")
             return None
     
-    def _extract_general_content(self, soup: BeautifulSoup) -> Optional[str]:
+    def _element_text_lines(self, elem: lxml_html.HtmlElement, max_chars: int = _GENERAL_CONTENT_MAX_CHARS) -> str:
+        """Non-empty stripped text nodes of an element, one per line, cut to max_chars"""
+        parts = []
+        total = 0
+        for text in elem.itertext():
+            text = text.strip()
+            if not text:
+                continue
+            parts.append(text)
+            total += len(text) + 1
+            if total > max_chars:
+                # Stop walking the subtree once there is enough text
+                break
+        return '\n'.join(parts)[:max_chars]
+
+    def _extract_general_content(self, tree: lxml_html.HtmlElement) -> Optional[str]:
         """Fallback general content extraction"""
         try:
-            # Remove unwanted elements
-            for elem in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-                elem.decompose()
+            # Remove unwanted elements in one pass, keeping the text that follows each one
+            etree.strip_elements(tree, *_NON_CONTENT_TAGS, with_tail=False)
             
             # Get main content areas
-            main_selectors = ['main', '.main-content', '.content', 'article', '.recipe']
-            
-            for selector in main_selectors:
-                main_elem = soup.select_one(selector)
-                if main_elem:
-                    text = main_elem.get_text(separator='\n', strip=True)
+            for selector in _MAIN_CONTENT_SELECTORS:
+                main_elems = selector(tree)
+                if main_elems:
+                    text = self._element_text_lines(main_elems[0])
                     if len(text) > 200:
-                        return text[:5000]  # Limit to 5000 characters
+                        return text
             
             # Fallback to body content
-            body = soup.find('body')
-            if body:
-                text = body.get_text(separator='\n', strip=True)
-                return text[:5000] if len(text) > 200 else None
+            body = next(tree.iter('body'), None)
+            if body is not None:
+                text = self._element_text_lines(body)
+                return text if len(text) > 200 else None
             
             return None
             
@@ -431,36 +673,30 @@ class RecipeExtractionService:
             logger.error(f"Error in general content extraction: {e}")
             return None
     
-    def _extract_main_image_url(self, html_content: str, base_url: str) -> Optional[str]:
-        """Extract the main recipe image URL from HTML"""
+    def _extract_main_image_src(self, tree: lxml_html.HtmlElement) -> Optional[str]:
+        """Extract the main recipe image src (possibly relative) from an already parsed page"""
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
             # Strategy 1: Look for recipe-specific image selectors
-            image_selectors = [
-                '.recipe-image img',
-                '.recipe-photo img', 
-                '.recipe img',
-                '[class*="recipe"] img',
-                'img[alt*="recipe" i]'
-            ]
-            
-            for selector in image_selectors:
-                img = soup.select_one(selector)
-                if img and img.get('src'):
-                    return self._resolve_image_url(img['src'], base_url)
+            for selector in _IMAGE_SELECTORS:
+                imgs = selector(tree)
+                if imgs and imgs[0].get('src'):
+                    return imgs[0].get('src')
+            
+            imgs = _RECIPE_ALT_IMAGE_XPATH(tree)
+            if imgs and imgs[0].get('src'):
+                return imgs[0].get('src')
             
             # Strategy 2: Look for Open Graph image
-            og_image = soup.find('meta', property='og:image')
-            if og_image and og_image.get('content'):
-                return self._resolve_image_url(og_image['content'], base_url)
+            og_images = _OG_IMAGE_XPATH(tree)
+            if og_images and og_images[0].get('content'):
+                return og_images[0].get('content')
             
             # Strategy 3: Look for the first prominent image
-            main_content = soup.select_one('main, article, .content, .recipe')
-            if main_content:
-                img = main_content.find('img')
-                if img and img.get('src'):
-                    return self._resolve_image_url(img['src'], base_url)
+            main_contents = _PROMINENT_CONTENT_SELECTOR(tree)
+            if main_contents:
+                img = next(main_contents[0].iter('img'), None)
+                if img is not None and img.get('src'):
+                    return img.get('src')
             
             return None
             
@@ -471,7 +707,6 @@ class RecipeExtractionService:
     def _resolve_image_url(self, img_src: str, base_url: str) -> str:
         """Resolve relative image URLs to absolute URLs"""
         try:
-            from urllib.parse import urljoin
             return urljoin(base_url, img_src)
         except Exception:
             return img_src
@@ -0,0 +1,77 @@
+"""Tests for splitting tall screenshots into OCR strips and joining the strip text"""
+
+from services.image_service import _merge_tile_lines, _should_tile, _tile_boxes
+
+# A 3000px-tall capture in three strips: boxes (0-1150), (850-2150), (1850-3000),
+# so the first seam's overlap is rows 850-1150 with its midline at 1000
+BOXES = _tile_boxes(800, 3000, 3)
+
+
+def test_tile_boxes_overlap_by_margin():
+    assert BOXES == [(0, 0, 800, 1150), (0, 850, 800, 2150), (0, 1850, 800, 3000)]
+
+
+def test_only_tall_narrow_images_are_tiled():
+    assert _should_tile(1080, 6000)
+    assert not _should_tile(3024, 4032)  # ordinary portrait photo
+    assert not _should_tile(500, 1800)
+
+
+def test_lines_differing_in_quantity_are_all_kept():
+    tiles = [
+        (BOXES[0], [(100, 130, "1 cup sugar"), (200, 230, "2 cups flour")]),
+        (BOXES[1], [(1300, 1330, "3 cups flour"), (1400, 1430, "1 tsp salt")]),
+    ]
+    assert _merge_tile_lines(tiles) == "1 cup sugar\n2 cups flour\n3 cups flour\n1 tsp salt"
+
+
+def test_lines_differing_in_step_number_are_all_kept():
+    tiles = [
+        (BOXES[0], [(100, 130, "Step 4: stir well"), (200, 230, "Step 5: bake 20 min")]),
+        (BOXES[1], [(1300, 1330, "Step 6: bake 25 min"), (1400, 1430, "Serve")]),
+    ]
+    assert _merge_tile_lines(tiles) == "Step 4: stir well\nStep 5: bake 20 min\nStep 6: bake 25 min\nServe"
+
+
+def test_repeated_lines_are_kept():
+    tiles = [
+        (BOXES[0], [(100, 130, "1 egg"), (500, 530, "1 egg")]),
+        (BOXES[1], [(1300, 1330, "1 egg")]),
+    ]
+    assert _merge_tile_lines(tiles) == "1 egg\n1 egg\n1 egg"
+
+
+def test_line_inside_overlap_is_kept_once():
+    tiles = [
+        (BOXES[0], [(100, 130, "1 cup sugar"), (900, 930, "2 cups flour")]),
+        (BOXES[1], [(900, 930, "2 cups flour"), (1300, 1330, "1 tsp salt")]),
+    ]
+    assert _merge_tile_lines(tiles) == "1 cup sugar\n2 cups flour\n1 tsp salt"
+
+
+def test_cut_lines_at_strip_edges_are_dropped():
+    tiles = [
+        # "1 tsp salt" is whole here; "2 cups flour" is cut by the strip's bottom edge
+        (BOXES[0], [(840, 870, "1 tsp salt"), (1130, 1150, "2 cups fl")]),
+        # ...and here the other way round
+        (BOXES[1], [(850, 870, "tsp salt"), (1130, 1170, "2 cups flour")]),
+    ]
+    assert _merge_tile_lines(tiles) == "1 tsp salt\n2 cups flour"
+
+
+def test_line_straddling_the_midline_is_never_lost():
+    # Each strip's reading of the box puts the line's centre on the other strip's side
+    tiles = [
+        (BOXES[0], [(985, 1017, "Bake 25 min")]),
+        (BOXES[1], [(984, 1014, "Bake 25 min")]),
+    ]
+    assert _merge_tile_lines(tiles) == "Bake 25 min"
+
+
+def test_three_strips():
+    tiles = [
+        (BOXES[0], [(100, 130, "a"), (1000, 1030, "b")]),
+        (BOXES[1], [(1000, 1030, "b"), (1500, 1530, "c"), (1990, 2020, "d")]),
+        (BOXES[2], [(1990, 2020, "d"), (2500, 2530, "e")]),
+    ]
+    assert _merge_tile_lines(tiles) == "a\nb\nc\nd\ne"
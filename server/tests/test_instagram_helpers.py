@@ -0,0 +1,122 @@
+"""Shortcode parsing and the per-post result cache / single-flight runs"""
+
+import asyncio
+
+import pytest
+
+from services import instagram_service as ig
+from services.instagram_service import _SHORTCODE_RE, extract_instagram_shortcode
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.instagram.com/p/CxYz_12-ab/",
+    "https://instagram.com/reel/Cabc123/?igsh=xyz",
+    "https://www.instagram.com/tv/Cabc123#comments",
+    "http://instagram.com/p/ABC",
+    "https://www.instagram.com/p/",
+    "https://www.instagram.com/p/?x=1",
+    "https://www.instagram.com/p/ABC%20D/",
+    "https://www.instagram.com/p/ÄBC/",
+    "https://www.instagram.com/cook/p/ABC/",
+    "https://notinstagram.com/p/ABC/",
+    "https://example.com/?next=instagram.com/p/ABC",
+    "https://www.instagram.com/stories/cook/123/",
+    "not a url",
+])
+def test_shortcode_matches_regex(url):
+    match = _SHORTCODE_RE.search(url)
+    assert extract_instagram_shortcode(url) == (match.group(1) if match else None)
+
+
+@pytest.fixture(autouse=True)
+def _clean_state():
+    ig._post_cache.clear()
+    ig._inflight_posts.clear()
+    yield
+    ig._post_cache.clear()
+    ig._inflight_posts.clear()
+
+
+def test_post_cache_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ig.time, "monotonic", lambda: now[0])
+    ig._cache_post("abc", {"success": True})
+    assert ig._get_cached_post("abc") == {"success": True}
+    now[0] += ig._POST_CACHE_TTL_SECONDS + 1
+    assert ig._get_cached_post("abc") is None
+    assert "abc" not in ig._post_cache
+
+
+def test_post_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(ig, "_POST_CACHE_MAX_ENTRIES", 2)
+    ig._cache_post("a", {"n": 1})
+    ig._cache_post("b", {"n": 2})
+    ig._get_cached_post("a")
+    ig._cache_post("c", {"n": 3})
+    assert ig._get_cached_post("b") is None
+    assert ig._get_cached_post("a") == {"n": 1}
+    assert ig._get_cached_post("c") == {"n": 3}
+
+
+def _fake_scrape(calls, release):
+    async def scrape(url, shortcode, emit):
+        calls.append(shortcode)
+        await emit("scrape", "Scraping", 30)
+        await release.wait()
+        return {"success": True, "shortcode": shortcode}
+    return scrape
+
+
+def test_concurrent_requests_share_one_run(monkeypatch):
+    calls = []
+
+    async def main():
+        release = asyncio.Event()
+        monkeypatch.setattr(ig, "_scrape_and_structure_post", _fake_scrape(calls, release))
+        progress = {"owner": [], "joiner": []}
+
+        def recorder(name):
+            async def emit(stage, label, pct):
+                progress[name].append(pct)
+            return emit
+
+        owner = asyncio.create_task(ig._scrape_and_structure_post_once("u", "abc", recorder("owner")))
+        await asyncio.sleep(0)
+        joiner = asyncio.create_task(ig._scrape_and_structure_post_once("u", "abc", recorder("joiner")))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(owner, joiner)
+        return results, progress
+
+    results, progress = asyncio.run(main())
+    assert calls == ["abc"]
+    assert results[0] == results[1] == {"success": True, "shortcode": "abc"}
+    assert progress["owner"] == [30]
+    assert ig._inflight_posts == {}
+    # A later request is served from the cache without another run
+    assert asyncio.run(ig._scrape_and_structure_post_once("u", "abc", None)) == results[0]
+    assert calls == ["abc"]
+
+
+def test_joined_request_retries_when_owner_is_cancelled(monkeypatch):
+    calls = []
+
+    async def noop(stage, label, pct):
+        pass
+
+    async def main():
+        release = asyncio.Event()
+        monkeypatch.setattr(ig, "_scrape_and_structure_post", _fake_scrape(calls, release))
+        owner = asyncio.create_task(ig._scrape_and_structure_post_once("u", "abc", noop))
+        await asyncio.sleep(0)
+        joiner = asyncio.create_task(ig._scrape_and_structure_post_once("u", "abc", noop))
+        await asyncio.sleep(0)
+        owner.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        result = await joiner
+        assert owner.cancelled()
+        return result
+
+    assert asyncio.run(main()) == {"success": True, "shortcode": "abc"}
+    assert calls == ["abc", "abc"]
@@ -0,0 +1,69 @@
+"""Charset sniffing and the structured-page cache used by web recipe extraction"""
+
+import importlib
+
+import pytest
+
+# The services package re-exports an instance under the module's name
+res = importlib.import_module("services.recipe_extraction_service")
+
+
+@pytest.mark.parametrize("html", [
+    b'<html><head><meta charset="windows-1252"></head><body>caf\xe9</body></html>',
+    b'<meta http-equiv="Content-Type" content="text/html; charset=ISO-8859-1">caf\xe9',
+    b'<?xml version="1.0" encoding="iso-8859-1"?><html>caf\xe9</html>',
+    b'\xef\xbb\xbf<html>caf\xc3\xa9</html>',
+])
+def test_declared_encodings_are_left_to_the_parser(html):
+    assert res._undeclared_page_encoding(html) is None
+
+
+def test_undeclared_utf8_page():
+    assert res._undeclared_page_encoding("<p>crème brûlée – 2 cups</p>".encode("utf-8")) == "utf-8"
+    assert res._undeclared_page_encoding(b"<p>plain ascii</p>") == "utf-8"
+
+
+def test_undeclared_legacy_page_is_detected():
+    html = ("<html><body><p>Crème brûlée à la française, très délicieuse. "
+            "Préparation: mélanger les œufs et le sucre.</p></body></html>" * 4).encode("cp1252")
+    encoding = res._undeclared_page_encoding(html)
+    if res.detect_charset is None:
+        assert encoding is None
+    else:
+        # Detection is heuristic; it only has to pick a single-byte codec that can read the page
+        assert encoding not in (None, "utf-8")
+        html.decode(encoding)
+
+
+def test_charset_declared_past_sniff_window_is_ignored():
+    html = b"<p>" + b"x" * res._CHARSET_SNIFF_BYTES + b'</p><meta charset="latin-1">'
+    assert res._undeclared_page_encoding(html) == "utf-8"
+
+
+def test_cache_key_normalization():
+    assert res._normalize_url_for_cache("HTTPS://Example.COM?b=2&a=1#steps") == "https://example.com/?a=1&b=2"
+
+
+@pytest.fixture
+def page_cache(monkeypatch):
+    monkeypatch.setattr(res, "_page_cache", type(res._page_cache)())
+    return res._page_cache
+
+
+def test_page_cache_expires(monkeypatch, page_cache):
+    now = [50.0]
+    monkeypatch.setattr(res.time, "monotonic", lambda: now[0])
+    res._cache_page("k", {"title": "Tart"})
+    assert res._get_cached_page("k") == {"title": "Tart"}
+    now[0] += res._PAGE_CACHE_TTL_SECONDS + 1
+    assert res._get_cached_page("k") is None
+    assert "k" not in page_cache
+
+
+def test_page_cache_evicts_least_recently_used(monkeypatch, page_cache):
+    monkeypatch.setattr(res, "_PAGE_CACHE_MAX_ENTRIES", 2)
+    res._cache_page("a", {})
+    res._cache_page("b", {})
+    res._get_cached_page("a")
+    res._cache_page("c", {})
+    assert list(page_cache) == ["a", "c"]
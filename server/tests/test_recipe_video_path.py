@@ -0,0 +1,43 @@
+"""The byte-table slug builder must produce the same keys as the original regex version"""
+
+import re
+import unicodedata
+
+import pytest
+
+from utils.recipe_video_path import recipe_video_storage_path, sanitize_recipe_title_for_filename
+
+
+def _regex_slug(title):
+    if not title or not str(title).strip():
+        return "recipe"
+    ascii_part = unicodedata.normalize("NFKD", str(title).strip()).encode("ascii", "ignore").decode("ascii")
+    slug = re.sub(r"-{2,}", "-", re.sub(r"[^a-zA-Z0-9._-]+", "-", ascii_part).strip("-"))
+    return (slug or "recipe")[:100].rstrip("-.") or "recipe"
+
+
+@pytest.mark.parametrize("title", [
+    None,
+    "",
+    "   ",
+    "Lemon Tart",
+    "  Crème brûlée (classic)  ",
+    "Mom's \"Best\" Chili!!!",
+    "Pad Thai -- 2 ways",
+    "---",
+    "...",
+    "日本のカレー",
+    "Jalapeño poppers 🌶️🔥",
+    "a.b_c-d",
+    "Tab\tand\nnewline",
+    "x" * 99 + "-yz",
+    "word " * 40,
+    "ﬁnest ½ cup pie",
+])
+def test_slug_matches_regex_version(title):
+    assert sanitize_recipe_title_for_filename(title) == _regex_slug(title)
+
+
+def test_storage_path_uses_slug_and_known_extension():
+    assert recipe_video_storage_path("abc", "Lemon Tart", ".MOV") == "videos/Lemon-Tart-abc.mov"
+    assert recipe_video_storage_path("abc", None, "avi") == "videos/recipe-abc.mp4"
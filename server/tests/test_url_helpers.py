@@ -0,0 +1,91 @@
+"""The URL helpers' fast paths must agree with urlparse on every input"""
+
+from urllib.parse import urlparse
+
+import pytest
+
+from utils.helpers import extract_domain, is_http_url, is_valid_url
+
+URLS = [
+    "https://www.allrecipes.com/recipe/123/pancakes/",
+    "http://example.com",
+    "https://Example.COM/Path?q=1#frag",
+    "HTTPS://EXAMPLE.COM/path",
+    "Http://example.com:8080",
+    "https://user:pw@example.com:8443/x",
+    "https://example.com?x=1",
+    "https://example.com#top",
+    "http://",
+    "http:///path",
+    "https://",
+    "ftp://files.example.com/a.txt",
+    "mailto:cook@example.com",
+    "example.com/recipe",
+    "not a url",
+    "http://[::1]:8000/",
+    "http://[::1",
+    "http://::1]/",
+    "http://[example.com]/",
+    " https://example.com",
+    "\thttps://example.com",
+    "https://bücher.example/rezept",
+    "http://exa\tmple.com",
+    "https://example.com\n/recipe",
+    "https://exam\r\nple.com/a\tb",
+    "HTTPS://EXA\tMPLE.com",
+]
+
+
+def _reference_parse(url):
+    try:
+        return urlparse(url)
+    except ValueError:
+        return None
+
+
+@pytest.mark.parametrize("url", URLS)
+def test_is_valid_url_matches_urlparse(url):
+    parsed = _reference_parse(url)
+    assert is_valid_url(url) == bool(parsed and parsed.scheme and parsed.netloc)
+
+
+@pytest.mark.parametrize("url", URLS)
+def test_is_http_url_matches_urlparse(url):
+    parsed = _reference_parse(url)
+    assert is_http_url(url) == bool(parsed and parsed.scheme in ("http", "https") and parsed.netloc)
+
+
+@pytest.mark.parametrize("url", URLS)
+def test_extract_domain_matches_urlparse(url):
+    parsed = _reference_parse(url)
+    assert extract_domain(url) == (parsed.netloc.lower() if parsed else None)
+
+
+def test_unclosed_ipv6_host_is_invalid():
+    assert not is_valid_url("http://[::1")
+    assert not is_http_url("http://[::1")
+    assert extract_domain("http://[::1") is None
+
+
+def test_leading_whitespace_is_handled_alike():
+    assert is_http_url(" https://a.com")
+    assert is_valid_url(" https://a.com")
+    assert extract_domain(" https://a.com") == "a.com"
+
+
+def test_tabs_and_newlines_are_removed_like_urlsplit():
+    assert extract_domain("http://exa\tmple.com") == "example.com"
+    assert extract_domain("https://exam\r\nple.com/a") == "example.com"
+    assert is_http_url("https://\nexample.com")
+
+
+@pytest.mark.parametrize("value", [None, 123, b"https://example.com", ["https://example.com"]])
+def test_non_strings_are_rejected(value):
+    assert not is_valid_url(value)
+    assert not is_http_url(value)
+    assert extract_domain(value) is None
+
+
+def test_empty_url():
+    assert not is_valid_url("")
+    assert extract_domain("") is None
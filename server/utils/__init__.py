@@ -4,13 +4,16 @@ Utilities module for souschef API
 This module contains utility functions, constants, and helpers.
 """
 
-from .constants import Messages, StatusCodes, FileConfig, OCRConfig, URLPatterns
+from .constants import Messages, StatusCodes, FileConfig, OCRConfig, URLPatterns, RecipeDomains
 from .helpers import (
     setup_logger,
+    is_http_url,
+    parse_url_cached,
     is_valid_url,
     extract_domain,
     format_error_response,
-    format_success_response
+    format_success_response,
+    format_success_response_bytes,
 )
 
 __all__ = [
@@ -20,11 +23,15 @@ __all__ = [
     'FileConfig',
     'OCRConfig',
     'URLPatterns',
+    'RecipeDomains',
     
     # Helper functions
     'setup_logger',
+    'is_http_url',
+    'parse_url_cached',
     'is_valid_url',
     'extract_domain',
     'format_error_response',
     'format_success_response',
+    'format_success_response_bytes',
 ]
\ No newline at end of file
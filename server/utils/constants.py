@@ -31,7 +31,28 @@ class FileConfig:
 # OCR Configuration
 class OCRConfig:
     CONFIG = "--oem 3 --psm 6"  # Optimized OCR configuration
+    PDF_CONFIG = "--oem 1 --psm 6"  # LSTM only, single text block: skips engine/layout detection for rendered pages
+    PDF_BINARIZE_THRESHOLD = 180  # Grayscale level above which rendered PDF pixels become white
 
 # URL Validation
 class URLPatterns:
     INSTAGRAM_DOMAINS = ['instagram.com', 'www.instagram.com']
+
+# Recipe sites
+class RecipeDomains:
+    # Sites that reliably publish schema.org Recipe JSON-LD or microdata, so the
+    # CSS-selector heuristics are not worth running on their pages
+    HIGH_CONFIDENCE = frozenset([
+        'allrecipes.com',
+        'foodnetwork.com',
+        'epicurious.com',
+        'bonappetit.com',
+        'seriouseats.com',
+        'simplyrecipes.com',
+        'cooking.nytimes.com',
+        'bbcgoodfood.com',
+        'food.com',
+        'delish.com',
+        'tasty.co',
+        'budgetbytes.com',
+    ])
@@ -2,39 +2,200 @@
 Utility functions for souschef API
 """
 
+import atexit
 import logging
-from typing import Optional, Any, Dict
-from urllib.parse import urlparse
+import logging.handlers
+import os
+import queue
+import re
+import time
+from functools import lru_cache
+from typing import Optional, Any, Dict, Set, Tuple
+from urllib.parse import ParseResult, urlparse
+
+import orjson
+
+# http(s) URLs with a plain ASCII host are split with string checks (lowercase schemes)
+# or a regex (other casings); anything else, such as bracketed IPv6 hosts or leading
+# whitespace, falls through to urlparse so the results always agree with it
+_COMMON_SCHEMES = ('http://', 'https://')
+_AUTHORITY_END = ('/', '?', '#')
+_HTTP_PREFIX_RE = re.compile(r'^https?://', re.IGNORECASE)
+_HTTP_SCHEMES = ('http', 'https')
+
+# Loggers only put records on a queue; one background listener owns the stderr
+# handler, so request paths never wait on the write
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that runs strftime once per second instead of once per record"""
+
+    _cached_time: Tuple[int, str] = (-1, '')
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, formatted = self._cached_time
+        if second != cached_second:
+            formatted = time.strftime(self.default_time_format, self.converter(record.created))
+            self._cached_time = (second, formatted)
+        return self.default_msec_format % (formatted, record.msecs)
+
+# One formatter and one stderr handler for the whole application
+_FORMATTER = _CachedTimeFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_FORMATTER)
+
+class _BatchedStreamHandler(logging.handlers.MemoryHandler):
+    """Buffers records during a burst and writes them to the stream in one call"""
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        # Also flush whenever the queue runs dry, so a quiet period never holds records back
+        return super().shouldFlush(record) or _log_queue.empty()
+
+    def flush(self) -> None:
+        with self.lock:
+            if not self.buffer or self.target is None:
+                return
+            target = self.target
+            try:
+                text = ''.join(target.format(record) + target.terminator for record in self.buffer)
+                with target.lock:
+                    target.stream.write(text)
+                    target.stream.flush()
+            except Exception:
+                self.handleError(self.buffer[-1])
+            finally:
+                self.buffer.clear()
+
+_batch_handler = _BatchedStreamHandler(capacity=256, flushLevel=logging.ERROR, target=_stream_handler)
+
+def _start_log_listener() -> logging.handlers.QueueListener:
+    listener = logging.handlers.QueueListener(_log_queue, _batch_handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+_log_listener = _start_log_listener()
+
+def _stop_log_listener() -> None:
+    """Flush whatever is still queued before the process exits"""
+    _log_listener.stop()
+    _batch_handler.flush()
+
+atexit.register(_stop_log_listener)
+
+def _restart_log_listener_in_child() -> None:
+    """Forked pool workers inherit the queue but not the listener thread"""
+    global _log_queue, _log_listener
+    # A fresh queue: the inherited one may still hold the parent's unwritten records,
+    # and its internal lock may have been mid-wait in the parent's listener at fork time
+    _log_queue = queue.SimpleQueue()
+    _queue_handler.queue = _log_queue
+    _batch_handler.buffer.clear()
+    _log_listener = _start_log_listener()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_log_listener_in_child)
+
+# Names already passed through setup_logger; repeat calls skip the handler check
+_configured_loggers: Set[str] = set()
 
 def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     """Setup a logger with consistent formatting"""
+    if name in _configured_loggers:
+        return logging.getLogger(name)
+    
     logger = logging.getLogger(name)
     
     if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        logger.addHandler(_queue_handler)
         logger.setLevel(level)
     
+    _configured_loggers.add(name)
     return logger
 
+def _authority_bounds(url: str) -> Optional[Tuple[int, int]]:
+    """(start, end) of the host[:port] part of an http(s) URL, or None when urlparse is needed"""
+    # urlsplit deletes tabs and newlines wherever they appear, so such URLs go through it
+    if '\t' in url or '\r' in url or '\n' in url:
+        return None
+    if url.startswith(_COMMON_SCHEMES):
+        start = url.index('//') + 2
+    else:
+        match = _HTTP_PREFIX_RE.match(url)
+        if match is None:
+            return None
+        start = match.end()
+    end = len(url)
+    for delimiter in _AUTHORITY_END:
+        found = url.find(delimiter, start, end)
+        if found != -1:
+            end = found
+    # urlparse validates bracketed hosts and NFKC-checks non-ASCII ones; leave those to it
+    authority = url[start:end]
+    if '[' in authority or ']' in authority or not authority.isascii():
+        return None
+    return start, end
+
+@lru_cache(maxsize=4096)
+def parse_url_cached(url: str) -> ParseResult:
+    """urlparse, memoized; the URL helpers share it so a URL is tokenized at most once"""
+    return urlparse(url)
+
+def is_http_url(url: str) -> bool:
+    """Check that a string is an http(s) URL with a host"""
+    if not isinstance(url, str):
+        return False
+    bounds = _authority_bounds(url)
+    if bounds is not None:
+        return bounds[1] > bounds[0]
+    try:
+        result = parse_url_cached(url)
+    except ValueError:
+        return False
+    return result.scheme in _HTTP_SCHEMES and bool(result.netloc)
+
 def is_valid_url(url: str) -> bool:
     """Validate if a string is a valid URL"""
+    # Checked before the cache, which can't hash arbitrary objects
+    if not isinstance(url, str) or not url:
+        return False
+    return _is_valid_url_cached(url)
+
+@lru_cache(maxsize=4096)
+def _is_valid_url_cached(url: str) -> bool:
+    bounds = _authority_bounds(url)
+    if bounds is not None:
+        return bounds[1] > bounds[0]
+    
+    # Other schemes (and anything unusual) go through the full parser
     try:
-        result = urlparse(url)
-        return all([result.scheme, result.netloc])
-    except Exception:
+        result = parse_url_cached(url)
+        return bool(result.scheme and result.netloc)
+    except ValueError:
         return False
 
+def _lowercase_host(host: str) -> str:
+    # Hosts are usually lowercase already; only allocate a new string when they are not
+    return host if host.islower() else host.lower()
+
 def extract_domain(url: str) -> Optional[str]:
     """Extract domain from URL"""
+    if not isinstance(url, str) or not url:
+        return None
+    return _extract_domain_cached(url)
+
+@lru_cache(maxsize=4096)
+def _extract_domain_cached(url: str) -> Optional[str]:
+    bounds = _authority_bounds(url)
+    if bounds is not None:
+        return _lowercase_host(url[bounds[0]:bounds[1]])
+    
     try:
-        parsed = urlparse(url)
-        return parsed.netloc.lower()
-    except Exception:
+        parsed = parse_url_cached(url)
+        return _lowercase_host(parsed.netloc)
+    except ValueError:
         return None
 
 def format_error_response(message: str, status_code: int, details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -57,3 +218,7 @@ def format_success_response(data: Any, message: str = "Success") -> Dict[str, An
         "message": message,
         "data": data
     }
+
+def format_success_response_bytes(data: Any, message: str = "Success") -> bytes:
+    """Success response already serialized to JSON, for routes that return raw bytes"""
+    return orjson.dumps({"success": True, "message": message, "data": data}, default=str)
@@ -2,22 +2,28 @@
 from __future__ import annotations
 
 import re
+import string
 import unicodedata
 from typing import Optional
 
-# S3/R2-safe key characters; keep filename readable in URLs
-_INVALID_RE = re.compile(r"[^a-zA-Z0-9._-]+")
+# S3/R2-safe key characters; keep filename readable in URLs. Every other byte becomes "-"
+# (runs are collapsed afterwards)
+_SAFE_CHARS = frozenset((string.ascii_letters + string.digits + "._-").encode("ascii"))
+_SLUG_TABLE = bytes(b if b in _SAFE_CHARS else ord("-") for b in range(256))
+_DASH_RUN_RE = re.compile(r"-{2,}")
 _MAX_SLUG_LEN = 100
+# Only this much of the title is normalized; far more than a slug ever keeps
+_MAX_TITLE_SCAN = 1000
 
 
 def sanitize_recipe_title_for_filename(title: Optional[str]) -> str:
     if not title or not str(title).strip():
         return "recipe"
-    raw = str(title).strip()
+    raw = str(title).strip()[:_MAX_TITLE_SCAN]
     normalized = unicodedata.normalize("NFKD", raw)
-    ascii_part = normalized.encode("ascii", "ignore").decode("ascii")
-    slug = _INVALID_RE.sub("-", ascii_part).strip("-")
-    slug = re.sub(r"-{2,}", "-", slug)
+    ascii_part = normalized.encode("ascii", "ignore")
+    slug = ascii_part.translate(_SLUG_TABLE).decode("ascii").strip("-")
+    slug = _DASH_RUN_RE.sub("-", slug)
     if not slug:
         slug = "recipe"
     return slug[:_MAX_SLUG_LEN].rstrip("-.") or "recipe"